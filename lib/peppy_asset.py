@@ -7,18 +7,22 @@ and UNC path resolution for remote client compatibility.
 """
 
 import base64
+import functools
 import hashlib
 import json
 import os
 import re
-import urllib.request
-import urllib.error
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from peppy_common import (
     SMB_SHARE_PATH,
     log_client,
 )
 
+# Parallel HTTP fetches for missing icons/fonts (independent, latency-bound)
+_FETCH_WORKERS = 8
+
 def _unc_paths_for_windows(server_info):
     """Build UNC paths for meter/spectrum templates on Windows (no SMB mount).
     
@@ -51,6 +55,79 @@ KNOWN_FORMAT_ICONS = [
 # Python set literal for all icons (used in handler patching)
 ALL_ICONS_SET = "{" + ", ".join(f"'{icon}'" for icon in KNOWN_FORMAT_ICONS) + "}"
 
+# Both upstream local_icons variants in one pattern, and their replacement:
+#   local_icons = {'tidal', 'cd', 'qobuz', 'dab', 'fm', 'radio'}
+#   local_icons = {'tidal', 'cd', 'qobuz'}
+_LOCAL_ICONS_PATTERN = re.compile(r"local_icons = \{'tidal', 'cd', 'qobuz'(?:, 'dab', 'fm', 'radio')?\}")
+_LOCAL_ICONS_REPLACEMENT = f"local_icons = {ALL_ICONS_SET}"
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_isfile(path):
+    """os.path.isfile() memoized for the setup/sync pass.
+
+    Anything here that creates a file calls _cached_isfile.cache_clear().
+    """
+    return os.path.isfile(path)
+
+
+def _dir_names(path):
+    """Names in a directory from a single scandir (empty set if unreadable)."""
+    try:
+        with os.scandir(path) as it:
+            return {entry.name for entry in it}
+    except OSError:
+        return set()
+
+
+# Meter skin images worth pulling into the page cache ahead of first display
+_PREWARM_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif')
+_PREWARM_MAX_BYTES = 64 * 1024 * 1024  # stop after this much; skins are far smaller
+
+
+def prewarm_meter_assets(meter_dir):
+    """Read a meter folder's images in a background thread to warm the OS cache.
+
+    Meter templates often live on the SMB mount, so the first pygame.image.load
+    of each skin file pays a network round-trip. Reading them while the
+    "waiting for server" screen is up hides that latency. Contents are
+    discarded; only the kernel/CIFS cache keeps them.
+
+    :param meter_dir: Meter template folder (templates/<meter.folder>)
+    :return: The started daemon thread, or None if meter_dir is not a directory
+    """
+    meter_dir = str(meter_dir)
+    if not os.path.isdir(meter_dir):
+        return None
+
+    def _prewarm():
+        buf = bytearray(256 * 1024)
+        total = 0
+        count = 0
+        for root, _dirs, files in os.walk(meter_dir):
+            for name in files:
+                if not name.lower().endswith(_PREWARM_EXTENSIONS):
+                    continue
+                try:
+                    with open(os.path.join(root, name), 'rb', buffering=0) as f:
+                        while total < _PREWARM_MAX_BYTES:
+                            n = f.readinto(buf)
+                            if not n:
+                                break
+                            total += n
+                except OSError:
+                    continue
+                count += 1
+                if total >= _PREWARM_MAX_BYTES:
+                    break
+            if total >= _PREWARM_MAX_BYTES:
+                break
+        log_client(f"Prewarmed {count} meter asset(s), {total // 1024} KiB from {meter_dir}", "trace", "config")
+
+    thread = threading.Thread(target=_prewarm, daemon=True, name="PeppyAssetPrewarm")
+    thread.start()
+    return thread
+
 
 def setup_format_icons(screensaver_path, server_ip, volumio_port=3000):
     """Ensure format icons are available for the handlers.
@@ -70,13 +147,15 @@ def setup_format_icons(screensaver_path, server_ip, volumio_port=3000):
     # Create directory if it doesn't exist
     os.makedirs(icons_dir, exist_ok=True)
     
-    # Check for missing icons and fetch from Volumio server
+    # Check for missing icons and fetch them from Volumio server concurrently
+    existing = _dir_names(icons_dir)
+    missing = [name for name in KNOWN_FORMAT_ICONS if f"{name}.svg" not in existing]
     icons_fetched = 0
-    for icon_name in KNOWN_FORMAT_ICONS:
-        icon_path = os.path.join(icons_dir, f"{icon_name}.svg")
-        if not os.path.exists(icon_path):
-            if _fetch_format_icon(icon_name, icons_dir, server_ip, volumio_port):
-                icons_fetched += 1
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(_FETCH_WORKERS, len(missing))) as pool:
+            icons_fetched = sum(pool.map(
+                lambda name: _fetch_format_icon(name, icons_dir, server_ip, volumio_port),
+                missing))
     
     if icons_fetched > 0:
         print(f"  Fetched {icons_fetched} missing icons from Volumio server")
@@ -97,6 +176,7 @@ def _fetch_format_icon(fmt, icons_dir, server_ip, volumio_port):
     :param volumio_port: Volumio HTTP port
     :return: True if fetched successfully, False otherwise
     """
+    import urllib.request  # lazy: only needed when something is fetched
     icon_filename = f"{fmt}.svg"
     local_path = os.path.join(icons_dir, icon_filename)
     
@@ -108,8 +188,10 @@ def _fetch_format_icon(fmt, icons_dir, server_ip, volumio_port):
         with urllib.request.urlopen(req, timeout=5) as response:
             if response.status == 200:
                 content = response.read()
-                # Verify it's actually SVG content
-                if b'<svg' in content.lower() or b'<?xml' in content:
+                # Verify it's actually SVG content (the markers sit near the top;
+                # don't lowercase the whole body)
+                head = content[:1024]
+                if b'<?xml' in head or b'<svg' in head.lower():
                     with open(local_path, 'wb') as f:
                         f.write(content)
                     return True
@@ -137,12 +219,18 @@ def setup_fonts(screensaver_path, server_ip, volumio_port=3000):
     fonts_dir = os.path.join(screensaver_path, 'fonts')
     os.makedirs(fonts_dir, exist_ok=True)
     log_client("--- Font Setup ---", "basic")
+    existing = _dir_names(fonts_dir)
+    missing = [f for f in KNOWN_PEPPY_FONTS if f not in existing]
+    fetched = {}
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(_FETCH_WORKERS, len(missing))) as pool:
+            fetched = dict(zip(missing, pool.map(
+                lambda f: _fetch_font(f, fonts_dir, server_ip, volumio_port), missing)))
     for filename in KNOWN_PEPPY_FONTS:
-        local_path = os.path.join(fonts_dir, filename)
-        if os.path.exists(local_path):
+        if filename not in fetched:
             log_client(f"  {filename}: present", "basic")
         else:
-            if _fetch_font(filename, fonts_dir, server_ip, volumio_port):
+            if fetched[filename]:
                 log_client(f"  {filename}: fetched from server", "basic")
             else:
                 log_client(f"  {filename}: MISSING", "basic")
@@ -151,6 +239,7 @@ def setup_fonts(screensaver_path, server_ip, volumio_port=3000):
 
 def _fetch_font(filename, fonts_dir, server_ip, volumio_port):
     """Fetch a font from server via plugin endpoint (base64). On error, log and return False."""
+    import urllib.request  # lazy: only needed when something is fetched
     local_path = os.path.join(fonts_dir, filename)
     url = f"http://{server_ip}:{volumio_port}/api/v1/pluginEndpoint"
     body = json.dumps({
@@ -194,12 +283,6 @@ def _patch_handlers_for_local_icons(screensaver_path):
     :param screensaver_path: Path to screensaver/ directory
     :return: Number of files patched
     """
-    # Patterns to match and replace
-    patterns = [
-        "local_icons = {'tidal', 'cd', 'qobuz', 'dab', 'fm', 'radio'}",
-        "local_icons = {'tidal', 'cd', 'qobuz'}",
-    ]
-    
     # Handler files that need patching
     handler_files = [
         'volumio_peppymeter.py',
@@ -212,22 +295,19 @@ def _patch_handlers_for_local_icons(screensaver_path):
     
     for handler_file in handler_files:
         filepath = os.path.join(screensaver_path, handler_file)
-        if not os.path.exists(filepath):
+        if not _cached_isfile(filepath):
             continue
             
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            modified = False
-            for pattern in patterns:
-                if pattern in content:
-                    # Check if already patched (contains our full set)
-                    if ALL_ICONS_SET not in content:
-                        content = content.replace(pattern, f"local_icons = {ALL_ICONS_SET}")
-                        modified = True
+            # Already patched files contain our full set
+            if ALL_ICONS_SET in content:
+                continue
+            content, n = _LOCAL_ICONS_PATTERN.subn(_LOCAL_ICONS_REPLACEMENT, content)
             
-            if modified:
+            if n:
                 with open(filepath, 'w', encoding='utf-8') as f:
                     f.write(content)
                 patched_count += 1
@@ -255,6 +335,7 @@ def _peppy_safe_name(name):
 
 
 def _peppy_post_json(url, payload, timeout=10):
+    import urllib.request  # lazy: only needed when something is fetched
     body = json.dumps(payload).encode('utf-8')
     req = urllib.request.Request(
         url, data=body, method='POST',
@@ -285,7 +366,7 @@ def _sync_one_file(base_url, kind, item, dest_dir):
     dest = os.path.join(dest_dir, name)
 
     # Already current?
-    if want and os.path.exists(dest):
+    if want and _cached_isfile(dest):
         try:
             if _peppy_sha256_file(dest).lower() == want:
                 return "current"
@@ -326,6 +407,7 @@ def _sync_one_file(base_url, kind, item, dest_dir):
             f.flush()
             os.fsync(f.fileno())
         os.replace(tmp, dest)
+        _cached_isfile.cache_clear()
         log_client(f"Handler sync: updated {name}", "verbose")
         return "updated"
     except Exception as e:
@@ -348,7 +430,7 @@ def _verify_manifest_files(items, dest_dir):
         if not _peppy_safe_name(name) or not want:
             continue
         dest = os.path.join(dest_dir, name)
-        if not os.path.exists(dest):
+        if not _cached_isfile(dest):
             stale.append(name)
             continue
         try:
@@ -19,6 +19,8 @@ Config model v2 (multi-profile):
 
 __version__ = "3.4.4"  # Footlocked to PeppyMeter Screensaver release
 
+import functools
+import ipaddress
 import json
 import logging
 import os
@@ -145,12 +147,19 @@ def apply_android_profile_defaults(profile):
     return profile
 
 
+# size -> family name that _resolve_pygame_ui_font last settled on (None means
+# SysFont(None)). Font objects themselves are not kept: they die with
+# pg.font.quit(), which the version dialog and reload paths may call.
+_ui_font_family = {}
+
+
 def _resolve_pygame_ui_font(pg, size):
     """Return a pygame Font for UI text on Linux, Windows, macOS, and Android.
 
     Tries common system families (including Linux ``sans``), validates with a test
     render to avoid SDL ``NULL pointer`` failures, then ``SysFont(None)``, then
-    ``Font(None)`` as last resort.
+    ``Font(None)`` as last resort. The family that worked is remembered per size,
+    so later calls open it directly instead of walking the list again.
     """
     try:
         size = int(size)
@@ -181,20 +190,23 @@ def _resolve_pygame_ui_font(pg, size):
         except Exception:
             return False
 
-    for name in names:
+    if size in _ui_font_family:
         try:
-            f = pg.font.SysFont(name, size)
+            f = pg.font.SysFont(_ui_font_family[size], size)
         except Exception:
-            continue
+            f = None
         if _font_renders(f):
             return f
+        del _ui_font_family[size]
 
-    try:
-        f = pg.font.SysFont(None, size)
+    for name in names + (None,):
+        try:
+            f = pg.font.SysFont(name, size)
+        except Exception:
+            continue
         if _font_renders(f):
+            _ui_font_family[size] = name
             return f
-    except Exception:
-        pass
 
     return pg.font.Font(None, size)
 
@@ -271,6 +283,27 @@ def init_client_debug(config):
     CLIENT_DEBUG_TRACE['wizard'] = debug_config.get('trace_wizard', False)
 
 
+_LOG_LEVEL_ORDER = {'off': 0, 'basic': 1, 'verbose': 2, 'trace': 3}
+
+
+def log_enabled(level='basic', trace_component=None):
+    """Return True if log_client() would print at this level/component.
+
+    Lets per-packet callers skip building an expensive message entirely.
+    """
+    current_level = _LOG_LEVEL_ORDER.get(CLIENT_DEBUG_LEVEL, 0)
+    required_level = _LOG_LEVEL_ORDER.get(level, 1)
+
+    # Check if level is sufficient
+    if current_level < required_level:
+        return False
+
+    # For trace level, also check component-specific flag
+    if level == 'trace' and trace_component:
+        return bool(CLIENT_DEBUG_TRACE.get(trace_component, False))
+    return True
+
+
 def log_client(message, level='basic', trace_component=None):
     """Log a debug message if the current debug level allows it.
 
@@ -280,19 +313,9 @@ def log_client(message, level='basic', trace_component=None):
         trace_component: For trace level, which component flag to check
                         ('spectrum', 'network', 'config', 'wizard')
     """
-    level_order = {'off': 0, 'basic': 1, 'verbose': 2, 'trace': 3}
-    current_level = level_order.get(CLIENT_DEBUG_LEVEL, 0)
-    required_level = level_order.get(level, 1)
-
-    # Check if level is sufficient
-    if current_level < required_level:
+    if not log_enabled(level, trace_component):
         return
 
-    # For trace level, also check component-specific flag
-    if level == 'trace' and trace_component:
-        if not CLIENT_DEBUG_TRACE.get(trace_component, False):
-            return
-
     # Format and print
     timestamp = datetime.now().strftime('%H:%M:%S.%f')[:-3]
     print(f"[{timestamp}] [CLIENT] {message}")
@@ -561,32 +584,47 @@ def save_config(config):
     return save_config_store(store)
 
 
-def is_first_run():
-    """Check if this is first run (no config, no profiles, or v1 with wizard not completed)."""
-    if not os.path.exists(CONFIG_FILE):
-        return True
+# Parsed config.json keyed by (st_mtime_ns, st_size); see _load_cached_raw()
+_raw_config_cache = {'key': None, 'raw': None}
+
 
+def _load_cached_raw():
+    """Return the parsed config.json as stored on disk, or None if missing/unreadable.
+
+    The parse is cached against the file's mtime and size, so repeat calls
+    cost one stat. Callers must treat the returned dict as read-only.
+    """
+    try:
+        st = os.stat(CONFIG_FILE)
+    except OSError:
+        return None
+    key = (st.st_mtime_ns, st.st_size)
+    if _raw_config_cache['key'] == key:
+        return _raw_config_cache['raw']
     try:
         with open(CONFIG_FILE, 'r') as f:
             raw = json.load(f)
     except (json.JSONDecodeError, IOError):
+        raw = None
+    _raw_config_cache['key'] = key
+    _raw_config_cache['raw'] = raw
+    return raw
+
+
+def is_first_run():
+    """Check if this is first run (no config, no profiles, or v1 with wizard not completed)."""
+    raw = _load_cached_raw()
+    if not isinstance(raw, dict):
         return True
 
     # v2 format: first run if no profiles exist
-    if isinstance(raw, dict) and raw.get('config_version') == CONFIG_VERSION:
-        profiles = raw.get('profiles', {})
-        return len(profiles) == 0
+    if raw.get('config_version') == CONFIG_VERSION:
+        return not raw.get('profiles')
 
-    # v1 format: check wizard_completed flag (legacy)
-    if isinstance(raw, dict):
-        # Old format: "server" is string/null, not a dict
-        if "server" in raw and not isinstance(raw["server"], dict):
-            return True
-        if "wizard_completed" in raw and raw["wizard_completed"] is False:
-            return True
-        return False
-
-    return True
+    # v1 format (legacy): old "server" string/null, or wizard explicitly not completed
+    if not isinstance(raw.get('server', {}), dict):
+        return True
+    return raw.get('wizard_completed') is False
 
 
 # =============================================================================
@@ -859,16 +897,19 @@ def validate_profile_paths(config):
 
 def get_template_folders(templates_path):
     """Return list of folder names under templates_path that contain meters.txt."""
-    if not templates_path or not os.path.isdir(templates_path):
+    if not templates_path:
         return []
     out = []
     try:
-        for name in sorted(os.listdir(templates_path)):
-            path = os.path.join(templates_path, name)
-            if os.path.isdir(path) and os.path.exists(os.path.join(path, 'meters.txt')):
-                out.append(name)
+        # scandir: is_dir() is answered from the directory listing on most
+        # platforms, saving a stat per entry (expensive over SMB)
+        with os.scandir(templates_path) as it:
+            for entry in it:
+                if entry.is_dir() and os.path.exists(os.path.join(entry.path, 'meters.txt')):
+                    out.append(entry.name)
     except (OSError, IOError):
-        pass
+        return []
+    out.sort()
     return out
 
 
@@ -877,21 +918,21 @@ def get_meter_sections(templates_path, meter_folder):
     if not templates_path or not meter_folder:
         return []
     meters_file = os.path.join(templates_path, meter_folder, 'meters.txt')
-    if not os.path.exists(meters_file):
-        return []
     try:
         import configparser
         cfg = configparser.ConfigParser()
-        cfg.read(meters_file)
+        # read() skips missing files, so no separate exists() round-trip
+        if not cfg.read(meters_file):
+            return []
         return cfg.sections()
     except Exception:
         return []
 
 
+@functools.lru_cache(maxsize=32)
 def _is_ip_address(host):
     """Return True if host is an IPv4 or IPv6 address, False for a hostname."""
     try:
-        import ipaddress
         ipaddress.ip_address(host)
         return True
     except ValueError:
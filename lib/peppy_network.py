@@ -6,29 +6,165 @@ Server discovery, config version listening, and config fetching.
 """
 
 import json
+import random
+import selectors
 import socket
 import struct
 import threading
 import time
-import urllib.request
-import urllib.error
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
 from peppy_common import (
     DISCOVERY_PORT,
     DISCOVERY_TIMEOUT,
+    _is_ip_address,
     _norm_str,
     log_client,
+    log_enabled,
 )
 
+# Optional C JSON parser for the always-on announcement path; parses bytes directly.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either.
+try:
+    import orjson
+
+    def _loads_packet(data):
+        return orjson.loads(data)
+except ImportError:
+    def _loads_packet(data):
+        return json.loads(data.decode('utf-8', errors='replace'))
+
+# Service name every server announcement carries; checked on the raw bytes
+# (independent of JSON spacing) so stray LAN traffic is dropped unparsed.
+_SERVICE_MARKER = b'peppy_level_server'
+
+# Fields ConfigVersionListener acts on, extracted once per distinct payload
+# (string fields already normalized with _norm_str).
+Announcement = namedtuple('Announcement', 'service config_version active_meter')
+
+# Last discovery payload with its parse and Announcement, shared by
+# ServerDiscovery and ConfigVersionListener (servers repeat identical announcements).
+_announcement_cache = (None, None, None)
+
+
+def _decode_announcement(data):
+    """Return (info dict, Announcement) for a discovery packet, or (None, None) if it is not one."""
+    global _announcement_cache
+    last_bytes, last_info, last_ann = _announcement_cache
+    if data == last_bytes:
+        return last_info, last_ann
+    if _SERVICE_MARKER not in data:
+        return None, None
+    try:
+        info = _loads_packet(data)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        info = None
+    if not isinstance(info, dict) or info.get('service') != 'peppy_level_server':
+        info = ann = None
+    else:
+        ann = Announcement(info['service'],
+                           _norm_str(info.get('config_version')),
+                           _norm_str(info.get('active_meter')))
+    _announcement_cache = (data, info, ann)
+    return info, ann
+
+
+def _parse_announcement(data):
+    """Return the parsed announcement dict for a discovery packet, or None if it is not one."""
+    return _decode_announcement(data)[0]
+
+
+def resolve_server_host(host):
+    """Resolve a manually configured server host to an IPv4 address.
+
+    IP literals are returned without any lookup. Otherwise host and
+    host.local are looked up concurrently, so an mDNS-only name no longer
+    waits for the plain lookup to fail first; the plain name still wins
+    when both resolve. Falls back to host unchanged (as before) if neither does.
+
+    :param host: Hostname or IP address from config / --server
+    :return: IP address string, or host itself if unresolvable
+    """
+    if _is_ip_address(host):
+        return host
+    names = [host]
+    if not host.lower().endswith('.local'):
+        names.append(f"{host}.local")
+
+    def lookup(name):
+        try:
+            infos = socket.getaddrinfo(name, None, family=socket.AF_INET, type=socket.SOCK_DGRAM)
+        except (socket.gaierror, UnicodeError):
+            return None
+        return infos[0][4][0] if infos else None
+
+    pool = ThreadPoolExecutor(max_workers=len(names))
+    try:
+        for future in [pool.submit(lookup, name) for name in names]:
+            ip = future.result()
+            if ip:
+                return ip
+    finally:
+        # A slower lookup still running is left to finish on its own
+        pool.shutdown(wait=False)
+    return host
+
+
 class ServerDiscovery:
     """Discovers PeppyMeter servers via UDP broadcast."""
     
-    def __init__(self, port=DISCOVERY_PORT, timeout=DISCOVERY_TIMEOUT):
+    def __init__(self, port=DISCOVERY_PORT, timeout=DISCOVERY_TIMEOUT, early_exit_ms=None):
+        """
+        :param port: UDP discovery port
+        :param timeout: Maximum seconds to listen
+        :param early_exit_ms: If set, return once at least one server is known and
+                              no new server has appeared for this many milliseconds.
+                              Once a server's repeat announcement reveals the
+                              broadcast interval, the quiet gap becomes 1.5x that
+                              interval instead.
+        """
         self.port = port
         self.timeout = timeout
+        self.early_exit_ms = early_exit_ms
         self.servers = {}  # {ip: discovery_data}
         self._stop = False
     
+    def _handle_packet(self, data, addr):
+        """Record or update a server from one announcement packet. Returns True if new."""
+        info = _parse_announcement(data)
+        if info is None:
+            if log_enabled("trace", "network"):
+                log_client(f"Discovery: ignored packet from {addr}", "trace", "network")
+            return False
+        ip = addr[0]
+        if ip not in self.servers:
+            hostname = info.get('hostname', ip)
+            print(f"  Found: {hostname} ({ip})")
+            log_client(f"Discovery: found server {hostname} ({ip})", "basic")
+            log_client(f"Discovery: server info: {info}", "verbose")
+            self.servers[ip] = {
+                'ip': ip,
+                'hostname': hostname,
+                'level_port': info.get('level_port', 5580),
+                'spectrum_port': info.get('spectrum_port', 5581),
+                'volumio_port': info.get('volumio_port', 3000),
+                'version': info.get('version', 1),
+                'config_version': info.get('config_version', ''),
+                'plugin_version': (info.get('plugin_version') or '').strip(),
+            }
+            return True
+        # Update config_version if changed
+        new_version = info.get('config_version', '')
+        if new_version and new_version != self.servers[ip].get('config_version'):
+            self.servers[ip]['config_version'] = new_version
+            log_client(f"Discovery: config version updated to {new_version}", "verbose")
+        pv = (info.get('plugin_version') or '').strip()
+        if pv and pv != self.servers[ip].get('plugin_version'):
+            self.servers[ip]['plugin_version'] = pv
+            log_client(f"Discovery: plugin_version updated to {pv}", "verbose")
+        return False
+    
     def discover(self):
         """Listen for server announcements, return dict of discovered servers."""
         print(f"Discovering PeppyMeter servers on UDP port {self.port}...")
@@ -36,54 +172,62 @@ class ServerDiscovery:
         
         sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        sock.settimeout(1.0)  # 1 second timeout for each recv
+        if hasattr(socket, 'SO_REUSEPORT'):
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            except OSError:
+                pass
+        sock.setblocking(False)
         sock.bind(('', self.port))
+        sel = selectors.DefaultSelector()
+        sel.register(sock, selectors.EVENT_READ)
         
-        start_time = time.time()
+        deadline = time.monotonic() + self.timeout
+        quiet = self.early_exit_ms / 1000.0 if self.early_exit_ms else None
+        last_new = None
+        first_seen = {}  # {ip: monotonic time of first announcement}
+        interval_known = False
         
-        while not self._stop and (time.time() - start_time) < self.timeout:
-            try:
-                data, addr = sock.recvfrom(1024)
-                try:
-                    info = json.loads(data.decode('utf-8', errors='replace'))
-                    if info.get('service') == 'peppy_level_server':
-                        ip = addr[0]
-                        if ip not in self.servers:
-                            hostname = info.get('hostname', ip)
-                            print(f"  Found: {hostname} ({ip})")
-                            log_client(f"Discovery: found server {hostname} ({ip})", "basic")
-                            log_client(f"Discovery: server info: {info}", "verbose")
-                            self.servers[ip] = {
-                                'ip': ip,
-                                'hostname': hostname,
-                                'level_port': info.get('level_port', 5580),
-                                'spectrum_port': info.get('spectrum_port', 5581),
-                                'volumio_port': info.get('volumio_port', 3000),
-                                'version': info.get('version', 1),
-                                'config_version': info.get('config_version', ''),
-                                'plugin_version': (info.get('plugin_version') or '').strip(),
-                            }
-                        else:
-                            # Update config_version if changed
-                            new_version = info.get('config_version', '')
-                            if new_version and new_version != self.servers[ip].get('config_version'):
-                                self.servers[ip]['config_version'] = new_version
-                                log_client(f"Discovery: config version updated to {new_version}", "verbose")
-                            pv = (info.get('plugin_version') or '').strip()
-                            if pv and pv != self.servers[ip].get('plugin_version'):
-                                self.servers[ip]['plugin_version'] = pv
-                                log_client(f"Discovery: plugin_version updated to {pv}", "verbose")
-                except (json.JSONDecodeError, UnicodeDecodeError):
-                    log_client(f"Discovery: invalid packet from {addr}", "trace", "network")
-                    pass
-            except socket.timeout:
-                continue
-            except Exception as e:
-                print(f"  Discovery error: {e}")
-                log_client(f"Discovery: error {e}", "verbose")
-                break
-        
-        sock.close()
+        try:
+            while not self._stop:
+                now = time.monotonic()
+                remaining = deadline - now
+                if remaining <= 0:
+                    break
+                wait = remaining
+                if quiet is not None and last_new is not None:
+                    quiet_left = last_new + quiet - now
+                    if quiet_left <= 0:
+                        log_client("Discovery: no new servers, finishing early", "verbose")
+                        break
+                    wait = min(wait, quiet_left)
+                # Wake at least once a second so stop() is honoured
+                if not sel.select(min(wait, 1.0)):
+                    continue
+                # Drain everything queued before going back to select()
+                while True:
+                    try:
+                        data, addr = sock.recvfrom(1024)
+                    except (BlockingIOError, InterruptedError):
+                        break
+                    if self._handle_packet(data, addr):
+                        last_new = time.monotonic()
+                        first_seen[addr[0]] = last_new
+                    elif quiet is not None and not interval_known and addr[0] in first_seen:
+                        # First repeat from a server gives the broadcast interval;
+                        # any other server broadcasting at that rate shows up within it
+                        interval = time.monotonic() - first_seen[addr[0]]
+                        if interval > 0.05:
+                            interval_known = True
+                            quiet = 1.5 * interval
+                            log_client(f"Discovery: broadcast interval ~{interval:.2f}s, "
+                                       f"quiet gap {quiet:.2f}s", "trace", "network")
+        except Exception as e:
+            print(f"  Discovery error: {e}")
+            log_client(f"Discovery: error {e}", "verbose")
+        finally:
+            sel.close()
+            sock.close()
         log_client(f"Discovery: found {len(self.servers)} servers", "verbose")
         return self.servers
     
@@ -102,6 +246,14 @@ class ConfigVersionListener(threading.Thread):
     
     Protocol version 3+ includes active_meter for random meter sync.
     """
+    DRAIN_BATCH = 16  # max packets read per wakeup (non-blocking)
+    # A reload becomes ready a random 250-750 ms after the latest signal, so a
+    # burst of announcements (or duplicates over several NICs) coalesces into
+    # one rebuild; a burst can postpone it by at most RELOAD_DEBOUNCE_MAX.
+    RELOAD_DEBOUNCE_MIN = 0.25
+    RELOAD_DEBOUNCE_JITTER = 0.5
+    RELOAD_DEBOUNCE_MAX = 1.5
+
     def __init__(self, port, current_version_holder, server_ip=None):
         super().__init__(daemon=True)
         self.port = port
@@ -109,19 +261,62 @@ class ConfigVersionListener(threading.Thread):
         self.server_ip = server_ip  # if set, only accept packets from this IP
         self.reload_requested = False
         self.reload_generation = 0  # bumped on each reload signal (invalidates client cache)
+        self._reload_first_at = 0.0  # time.monotonic() of the first signal of the pending reload
+        self._reload_ready_at = 0.0  # time.monotonic() from which is_reload_ready() is True
         self.new_active_meter = None  # Set when active_meter changes (for config update)
         self.first_announcement_received = False  # True after first valid UDP packet (for sync screen)
+        self.announced_version = ''  # config_version from the latest announcement
         self._stop = False
         self._sock = None
         self.bound_port = None  # Actual local UDP port (may differ if multiple clients on one host)
         self._bound_event = threading.Event()
         self.ignore_active_meter = False  # True in kiosk mode: skip server active_meter changes
 
+    def _handle_packet(self, data, addr):
+        """Apply one discovery announcement to the reload/sync state."""
+        if self.server_ip is not None and addr[0] != self.server_ip:
+            return
+        ann = _decode_announcement(data)[1]
+        if ann is None:
+            return
+        
+        # Mark that we've received at least one announcement (for "waiting for server" screen)
+        self.first_announcement_received = True
+        if ann.active_meter:
+            self.new_active_meter = ann.active_meter
+        
+        # Check config_version change (file-based config changes)
+        if ann.config_version:
+            self.announced_version = ann.config_version
+            current = self.current_version_holder.get('version', '')
+            if ann.config_version != _norm_str(current):
+                self._signal_reload()
+        
+        # Check active_meter change (random meter sync, protocol v3+)
+        # In kiosk mode (ignore_active_meter=True), server active_meter
+        # broadcasts are irrelevant - the client picks its own random meter.
+        if not self.ignore_active_meter and ann.active_meter:
+            current_meter = self.current_version_holder.get('active_meter', '')
+            if ann.active_meter != _norm_str(current_meter):
+                # Active meter changed - trigger reload with new meter name
+                self.new_active_meter = ann.active_meter
+                self._signal_reload()
+
     def _signal_reload(self):
         """Request a config reload; bump generation so clients re-evaluate."""
+        now = time.monotonic()
+        if not self.reload_requested:
+            self._reload_first_at = now
+        self._reload_ready_at = min(
+            now + self.RELOAD_DEBOUNCE_MIN + random.random() * self.RELOAD_DEBOUNCE_JITTER,
+            self._reload_first_at + self.RELOAD_DEBOUNCE_MAX)
         self.reload_requested = True
         self.reload_generation += 1
 
+    def is_reload_ready(self):
+        """True once a requested reload's debounce window has passed."""
+        return self.reload_requested and time.monotonic() >= self._reload_ready_at
+
     def wait_until_bound(self, timeout=5.0):
         """Wait for bind attempt to finish (success or failure). Returns True if bound to a port."""
         self._bound_event.wait(timeout)
@@ -137,7 +332,7 @@ class ConfigVersionListener(threading.Thread):
                     self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
                 except OSError:
                     pass
-            self._sock.settimeout(1.0)
+            self._sock.setblocking(False)
             try:
                 self._sock.bind(('', self.port))
             except OSError:
@@ -152,48 +347,25 @@ class ConfigVersionListener(threading.Thread):
             self._bound_event.set()
         if self.bound_port is None:
             return
-        while not self._stop:
-            try:
-                data, addr = self._sock.recvfrom(1024)
-                if self.server_ip is not None and addr[0] != self.server_ip:
+        sel = selectors.DefaultSelector()
+        sel.register(self._sock, selectors.EVENT_READ)
+        try:
+            while not self._stop:
+                if not sel.select(1.0):
                     continue
-                try:
-                    info = json.loads(data.decode('utf-8', errors='replace'))
-                    if info.get('service') != 'peppy_level_server':
-                        continue
-                    
-                    # Mark that we've received at least one announcement (for "waiting for server" screen)
-                    self.first_announcement_received = True
-                    if info.get('active_meter'):
-                        self.new_active_meter = _norm_str(info.get('active_meter'))
-                    
-                    # Check config_version change (file-based config changes)
-                    new_version = info.get('config_version', '')
-                    if new_version:
-                        current = self.current_version_holder.get('version', '')
-                        if _norm_str(new_version) != _norm_str(current):
-                            self._signal_reload()
-                    
-                    # Check active_meter change (random meter sync, protocol v3+)
-                    # In kiosk mode (ignore_active_meter=True), server active_meter
-                    # broadcasts are irrelevant - the client picks its own random meter.
-                    if not self.ignore_active_meter:
-                        new_meter = info.get('active_meter', '')
-                        if new_meter:
-                            current_meter = self.current_version_holder.get('active_meter', '')
-                            if _norm_str(new_meter) != _norm_str(current_meter):
-                                # Active meter changed - trigger reload with new meter name
-                                self.new_active_meter = _norm_str(new_meter)
-                                self._signal_reload()
-                            
-                except (json.JSONDecodeError, UnicodeDecodeError):
-                    pass
-            except socket.timeout:
-                continue
-            except OSError:
-                if self._stop:
-                    break
+                # Drain whatever the kernel already queued in one wakeup
+                for _ in range(self.DRAIN_BATCH):
+                    try:
+                        data, addr = self._sock.recvfrom(1024)
+                    except (BlockingIOError, InterruptedError):
+                        break
+                    self._handle_packet(data, addr)
+        except (OSError, ValueError):
+            # stop_listener() closes the socket under us
+            if not self._stop:
                 raise
+        finally:
+            sel.close()
         try:
             self._sock.close()
         except Exception:
@@ -218,8 +390,13 @@ class ConfigFetcher:
     
     Uses Volumio plugin API endpoint to get config without SMB symlink issues.
     The server IP address from discovery is used for robust connectivity.
+    One HTTP/1.1 connection is kept alive and reused across fetches, and
+    repeat fetches are conditional (ETag / Last-Modified), so an unchanged
+    config costs a 304 instead of a full download and JSON parse.
     """
     
+    CONFIG_PATH = "/api/v1/pluginEndpoint?endpoint=peppy_screensaver&method=getRemoteConfig"
+    
     def __init__(self, server_ip, volumio_port=3000):
         self.server_ip = server_ip
         self.volumio_port = volumio_port
@@ -229,6 +406,57 @@ class ConfigFetcher:
         # Persist countdown settings from server
         self.persist_duration = 0  # 0 = disabled
         self.persist_display = "freeze"
+        self._conn = None  # Kept-alive http.client.HTTPConnection (created on first fetch)
+        self._conn_lock = threading.Lock()
+        # Validators of the response behind cached_config, sent back on refetch
+        self._etag = None
+        self._last_modified = None
+    
+    def _close_conn(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+    
+    def _get(self, path, headers=None):
+        """GET path on the kept-alive connection.
+        
+        A connection the server closed while idle is rebuilt and the request
+        retried once; any other failure drops the connection and re-raises.
+        
+        :param headers: Extra request headers (e.g. conditional-GET validators)
+        :return: (status, reason, body bytes, response HTTPMessage); a gzip
+                 Content-Encoding is already decoded in body
+        """
+        # http.client/gzip are only needed once a fetch happens; importing them
+        # lazily keeps --help, the wizards and discovery-only paths lighter
+        import gzip
+        import http.client
+        request_headers = {'Accept': 'application/json', 'Accept-Encoding': 'gzip'}
+        if headers:
+            request_headers.update(headers)
+        with self._conn_lock:
+            for attempt in (0, 1):
+                if self._conn is None:
+                    self._conn = http.client.HTTPConnection(
+                        self.server_ip, self.volumio_port, timeout=10)
+                try:
+                    self._conn.request('GET', path, headers=request_headers)
+                    response = self._conn.getresponse()
+                    body = response.read()
+                    if body and response.getheader('Content-Encoding', '').lower() == 'gzip':
+                        body = gzip.decompress(body)
+                    return response.status, response.reason, body, response.msg
+                except (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                        ConnectionResetError, BrokenPipeError):
+                    self._close_conn()
+                    if attempt:
+                        raise
+                except Exception:
+                    self._close_conn()
+                    raise
     
     def fetch(self):
         """
@@ -236,40 +464,48 @@ class ConfigFetcher:
         
         Returns (success, config_content, version) tuple.
         """
-        # Use direct IP address for reliable connectivity
-        url = f"http://{self.server_ip}:{self.volumio_port}/api/v1/pluginEndpoint?endpoint=peppy_screensaver&method=getRemoteConfig"
-        
+        import http.client
         try:
-            req = urllib.request.Request(url, headers={'Accept': 'application/json'})
-            with urllib.request.urlopen(req, timeout=10) as response:
-                data = json.loads(response.read().decode('utf-8', errors='replace'))
-                
-                # Volumio REST API wraps plugin response in 'data' field
-                # Response format: {"success": true, "data": {"success": true, "version": "...", "config": "..."}}
-                if data.get('success'):
-                    inner = data.get('data', {})
-                    if inner.get('success'):
-                        self.cached_config = inner.get('config', '')
-                        self.cached_version = inner.get('version', '')
-                        self.cached_plugin_version = inner.get('plugin_version')
-                        # Extract persist settings from server
-                        self.persist_duration = int(inner.get('persist_duration', 0) or 0)
-                        self.persist_display = inner.get('persist_display', 'freeze') or 'freeze'
-                        return True, self.cached_config, self.cached_version
-                    else:
-                        error = inner.get('error', 'Unknown error')
-                        print(f"  Plugin error fetching config: {error}")
-                        return False, None, None
+            conditional = {}
+            if self.cached_config is not None:
+                if self._etag:
+                    conditional['If-None-Match'] = self._etag
+                if self._last_modified:
+                    conditional['If-Modified-Since'] = self._last_modified
+            status, reason, body, response_headers = self._get(self.CONFIG_PATH, conditional)
+            if status == 304 and self.cached_config is not None:
+                log_client("Config not modified on server, using cached config", "verbose", "network")
+                return True, self.cached_config, self.cached_version
+            if status != 200:
+                print(f"  HTTP error fetching config: {status} {reason}")
+                return False, None, None
+            data = json.loads(body.decode('utf-8', errors='replace'))
+            
+            # Volumio REST API wraps plugin response in 'data' field
+            # Response format: {"success": true, "data": {"success": true, "version": "...", "config": "..."}}
+            if data.get('success'):
+                inner = data.get('data', {})
+                if inner.get('success'):
+                    self.cached_config = inner.get('config', '')
+                    self.cached_version = inner.get('version', '')
+                    self.cached_plugin_version = inner.get('plugin_version')
+                    # Extract persist settings from server
+                    self.persist_duration = int(inner.get('persist_duration', 0) or 0)
+                    self.persist_display = inner.get('persist_display', 'freeze') or 'freeze'
+                    self._etag = response_headers.get('ETag')
+                    self._last_modified = response_headers.get('Last-Modified')
+                    return True, self.cached_config, self.cached_version
                 else:
-                    error = data.get('error', 'Unknown error')
-                    print(f"  Server error fetching config: {error}")
+                    error = inner.get('error', 'Unknown error')
+                    print(f"  Plugin error fetching config: {error}")
                     return False, None, None
-                    
-        except urllib.error.HTTPError as e:
-            print(f"  HTTP error fetching config: {e.code} {e.reason}")
-            return False, None, None
-        except urllib.error.URLError as e:
-            print(f"  URL error fetching config: {e.reason}")
+            else:
+                error = data.get('error', 'Unknown error')
+                print(f"  Server error fetching config: {error}")
+                return False, None, None
+                
+        except (http.client.HTTPException, OSError) as e:
+            print(f"  Connection error fetching config: {e}")
             return False, None, None
         except json.JSONDecodeError as e:
             print(f"  JSON error parsing config response: {e}")
@@ -278,6 +514,24 @@ class ConfigFetcher:
             print(f"  Error fetching config: {e}")
             return False, None, None
     
+    def fetch_if_changed(self, known_version):
+        """
+        Like fetch(), but skip the HTTP round-trip when known_version (e.g. the
+        config_version from the latest UDP announcement) matches the cached one.
+        
+        Returns (success, config_content, version) tuple.
+        """
+        if (known_version and self.cached_config is not None
+                and _norm_str(known_version) == _norm_str(self.cached_version)):
+            log_client(f"Config version {known_version!r} unchanged, using cached config", "verbose", "network")
+            return True, self.cached_config, self.cached_version
+        return self.fetch()
+    
+    def close(self):
+        """Close the kept-alive HTTP connection (reopened on next fetch)."""
+        with self._conn_lock:
+            self._close_conn()
+    
     def has_changed(self, new_version):
         """Check if config version has changed."""
         return new_version and new_version != self.cached_version
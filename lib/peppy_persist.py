@@ -28,6 +28,10 @@ class PersistManager:
     Usage: Call check_metadata_status() on each render frame to monitor changes.
     """
     
+    # Slots: check_metadata_status() reads these on every render frame
+    __slots__ = ('persist_duration', 'persist_display', '_last_status', '_last_status_raw',
+                 '_deadline', '_deadline_lock', '_wake', '_worker', '_shutdown')
+    
     def __init__(self, persist_duration=0, persist_display="freeze"):
         """
         :param persist_duration: Countdown duration in seconds (0 = disabled)
@@ -35,8 +39,15 @@ class PersistManager:
         """
         self.persist_duration = persist_duration
         self.persist_display = persist_display
-        self._persist_timer = None
         self._last_status = None
+        self._last_status_raw = None  # metadata 'status' value last seen as handled
+        # One long-lived expiry thread (started on first countdown) waits for
+        # _deadline; restarting or cancelling the countdown just moves it.
+        self._deadline = None  # time.monotonic() at which the file expires
+        self._deadline_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._worker = None
+        self._shutdown = False
     
     def update_settings(self, persist_duration, persist_display):
         """Update persist settings (e.g., when server config changes)."""
@@ -57,11 +68,18 @@ class PersistManager:
         
         :param metadata_dict: Shared metadata dict with 'status' and 'volatile' keys
         """
-        status = (metadata_dict.get("status", "") or "").lower()
-        volatile = metadata_dict.get("volatile", False) or False
+        raw = metadata_dict.get("status")
+        # Per-frame fast path: same raw value as last handled, nothing to do
+        if raw is self._last_status_raw or raw == self._last_status_raw:
+            return
+        status = raw.lower() if raw else ""
+        volatile = bool(metadata_dict.get("volatile"))
         
         if status != self._last_status:
             self._on_status_change(status, volatile)
+        # A skipped volatile change leaves _last_status as is; re-check next frame
+        if status == self._last_status:
+            self._last_status_raw = raw
     
     def _on_status_change(self, status, volatile=False):
         """
@@ -95,49 +113,80 @@ class PersistManager:
     
     def _start_persist_countdown(self):
         """Create persist file and start expiration timer."""
-        import time as time_module
-        import threading
-        
         # Cancel any existing timer
         self._cancel_timer()
         
         # Write persist file (format: duration:timestamp_ms:display_mode)
-        timestamp_ms = int(time_module.time() * 1000)
+        timestamp_ms = time.time_ns() // 1_000_000
         content = f"{self.persist_duration}:{timestamp_ms}:{self.persist_display}"
         
         try:
-            with open(PERSIST_FILE, 'w') as f:
-                f.write(content)
+            # Tiny payload: write it unbuffered, no text-file wrapper. Write a
+            # sibling temp file and rename it over PERSIST_FILE so the render
+            # code never reads a truncated or half-written record.
+            tmp = f"{PERSIST_FILE}.{os.getpid()}.tmp"
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, content.encode())
+            finally:
+                os.close(fd)
+            try:
+                os.replace(tmp, PERSIST_FILE)
+            except OSError:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
             log_client(f"Persist: started countdown ({self.persist_duration}s, mode={self.persist_display})", "verbose")
         except Exception as e:
             log_client(f"Persist: failed to write file: {e}", "debug")
             return
         
-        # Start timer to remove file after persist_duration
-        def expire_persist():
+        # Arm the expiry worker to remove the file after persist_duration
+        with self._deadline_lock:
+            self._deadline = time.monotonic() + self.persist_duration
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._expiry_loop, daemon=True)
+            self._worker.start()
+        self._wake.set()
+    
+    def _expiry_loop(self):
+        """Expiry worker: remove the persist file once the current deadline passes."""
+        while not self._shutdown:
+            with self._deadline_lock:
+                deadline = self._deadline
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if self._wake.wait(timeout):
+                # Deadline moved, cancelled or shutdown - re-read it
+                self._wake.clear()
+                continue
+            with self._deadline_lock:
+                if self._deadline is None or time.monotonic() < self._deadline:
+                    continue
+                self._deadline = None
             self._remove_persist_file()
             log_client("Persist: timer expired, file removed", "verbose")
-            self._persist_timer = None
-        
-        self._persist_timer = threading.Timer(self.persist_duration, expire_persist)
-        self._persist_timer.daemon = True
-        self._persist_timer.start()
     
     def _cancel_timer(self):
-        """Cancel persist expiration timer if running."""
-        if self._persist_timer:
-            self._persist_timer.cancel()
-            self._persist_timer = None
+        """Cancel the pending persist expiration, if any."""
+        with self._deadline_lock:
+            if self._deadline is None:
+                return
+            self._deadline = None
+        self._wake.set()
     
     def _remove_persist_file(self):
         """Remove persist file if it exists."""
         try:
-            if os.path.exists(PERSIST_FILE):
-                os.remove(PERSIST_FILE)
-        except Exception:
+            os.unlink(PERSIST_FILE)
+        except OSError:
+            # FileNotFoundError included: nothing to remove
             pass
     
     def cleanup(self):
-        """Cleanup on shutdown - cancel timer and remove file."""
+        """Cleanup on shutdown - stop the expiry worker and remove file."""
+        self._shutdown = True
         self._cancel_timer()
+        self._wake.set()
         self._remove_persist_file()
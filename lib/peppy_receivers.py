@@ -5,9 +5,13 @@ PeppyMeter Remote Client - Audio data receivers.
 UDP receivers for audio level and spectrum data from the PeppyMeter server.
 """
 
+import array
+import heapq
+import itertools
 import json
 import socket
 import struct
+import sys
 import threading
 import time
 
@@ -15,8 +19,87 @@ from peppy_common import (
     __version__,
     DISCOVERY_PORT,
     log_client,
+    log_enabled,
 )
 
+# Precompiled packet layouts (little-endian)
+_LEVEL_STRUCT = struct.Struct('<Ifff')      # seq, left, right, mono
+_SPECTRUM_HEADER = struct.Struct('<IH')     # seq, bin count
+
+# Requested SO_RCVBUF for the level/spectrum sockets: enough to ride out a
+# brief stall of the receive thread without drops, small enough that a
+# backlog never turns into seconds of stale levels. Linux caps the request at
+# net.core.rmem_max (often ~208 KiB); raise that sysctl for the full size.
+_UDP_RCVBUF = 1024 * 1024
+
+
+def _raise_rcvbuf(sock):
+    """Best-effort enlarge sock's receive buffer to _UDP_RCVBUF."""
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _UDP_RCVBUF)
+    except OSError:
+        return
+    if log_enabled('trace', 'network'):
+        log_client(f"UDP receive buffer: {sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)} bytes "
+                   f"(requested {_UDP_RCVBUF})", "trace", "network")
+
+
+class _IntervalScheduler:
+    """
+    One daemon thread running periodic callbacks for every receiver.
+    
+    schedule() returns a handle for cancel(). Entries sit in a heap ordered by
+    next due time (time.monotonic()); the thread sleeps on a Condition until
+    the earliest one is due, so adding receivers never adds threads.
+    """
+    
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._heap = []  # (due, seq, handle)
+        self._seq = itertools.count()
+        self._thread = None
+    
+    def schedule(self, interval, fn):
+        """Call fn every interval seconds (first call one interval from now). Returns a handle."""
+        handle = {'interval': interval, 'fn': fn, 'cancelled': False}
+        with self._cond:
+            heapq.heappush(self._heap, (time.monotonic() + interval, next(self._seq), handle))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return handle
+    
+    def cancel(self, handle):
+        """Stop a scheduled callback (its heap entry is dropped when it comes due)."""
+        with self._cond:
+            handle['cancelled'] = True
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    while self._heap and self._heap[0][2]['cancelled']:
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    due = self._heap[0][0]
+                    delay = due - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                _, _, handle = heapq.heappop(self._heap)
+                heapq.heappush(self._heap, (due + handle['interval'], next(self._seq), handle))
+            try:
+                handle['fn']()
+            except Exception as e:
+                log_client(f"Scheduled callback failed: {e}", "verbose", "network")
+
+
+# Shared by all receivers (LevelReceiver heartbeats)
+_SCHEDULER = _IntervalScheduler()
+
 class LevelReceiver:
     """
     Receives audio level data over UDP.
@@ -33,6 +116,12 @@ class LevelReceiver:
     CLIENT_VERSION = 2  # Protocol version
     HEARTBEAT_INTERVAL = 30  # seconds between heartbeats
     
+    __slots__ = ('server_ip', 'port', 'sock', '_running', '_thread', '_heartbeat_handle',
+                 'discovery_listen_port', 'spectrum_listen_port', 'spectrum_default_port',
+                 'actual_listen_port', 'client_id', 'subscriptions',
+                 '_heartbeat_msg', '_unregister_msg',
+                 'left', 'right', 'mono', 'seq', 'last_update', 'new_data', '_latest')
+    
     def __init__(self, server_ip, port=5580, client_id=None, subscriptions=None,
                  discovery_listen_port=None, spectrum_listen_port=None, spectrum_default_port=5581):
         self.server_ip = server_ip
@@ -40,7 +129,7 @@ class LevelReceiver:
         self.sock = None
         self._running = False
         self._thread = None
-        self._heartbeat_thread = None
+        self._heartbeat_handle = None
         # Optional ports for registration when multiple clients share one host (ephemeral UDP binds)
         self.discovery_listen_port = discovery_listen_port
         self.spectrum_listen_port = spectrum_listen_port
@@ -60,12 +149,26 @@ class LevelReceiver:
         # What data streams this client subscribes to
         self.subscriptions = subscriptions or ['meters']
         
+        # Heartbeat/unregister payloads depend only on client_id: encode once
+        self._heartbeat_msg = json.dumps({
+            'type': 'heartbeat',
+            'client_id': self.client_id
+        }).encode('utf-8')
+        self._unregister_msg = json.dumps({
+            'type': 'unregister',
+            'client_id': self.client_id
+        }).encode('utf-8')
+        
         # Current level data (thread-safe via GIL for simple reads)
         self.left = 0.0
         self.right = 0.0
         self.mono = 0.0
         self.seq = 0
         self.last_update = 0
+        # (left, right, mono, seq) of the latest packet, replaced as one tuple
+        self._latest = (0.0, 0.0, 0.0, 0)
+        # Set on every level packet; a display can wait() on it instead of polling
+        self.new_data = threading.Event()
     
     def _send_registration(self):
         """Send registration packet to server."""
@@ -94,11 +197,7 @@ class LevelReceiver:
         if not self.sock or not self.server_ip:
             return
         try:
-            msg = json.dumps({
-                'type': 'heartbeat',
-                'client_id': self.client_id
-            }).encode('utf-8')
-            self.sock.sendto(msg, (self.server_ip, self.port))
+            self.sock.sendto(self._heartbeat_msg, (self.server_ip, self.port))
         except Exception:
             pass  # Heartbeat failures are silent
     
@@ -107,21 +206,10 @@ class LevelReceiver:
         if not self.sock or not self.server_ip:
             return
         try:
-            msg = json.dumps({
-                'type': 'unregister',
-                'client_id': self.client_id
-            }).encode('utf-8')
-            self.sock.sendto(msg, (self.server_ip, self.port))
+            self.sock.sendto(self._unregister_msg, (self.server_ip, self.port))
         except Exception:
             pass  # Unregister failures are silent
     
-    def _heartbeat_loop(self):
-        """Background thread to send periodic heartbeats."""
-        while self._running:
-            time.sleep(self.HEARTBEAT_INTERVAL)
-            if self._running:
-                self._send_heartbeat()
-    
     def start(self):
         """Start receiving level data in background thread."""
         if self._running:
@@ -133,6 +221,7 @@ class LevelReceiver:
                 self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
             except OSError:
                 pass
+        _raise_rcvbuf(self.sock)
         self.sock.settimeout(1.0)
         try:
             self.sock.bind(('', self.port))
@@ -147,9 +236,8 @@ class LevelReceiver:
         # Send registration to server
         self._send_registration()
 
-        # Start heartbeat thread
-        self._heartbeat_thread = threading.Thread(target=self._heartbeat_loop, daemon=True)
-        self._heartbeat_thread.start()
+        # Periodic heartbeats run on the shared scheduler thread
+        self._heartbeat_handle = _SCHEDULER.schedule(self.HEARTBEAT_INTERVAL, self._send_heartbeat)
 
         # Start receive thread
         self._thread = threading.Thread(target=self._receive_loop, daemon=True)
@@ -158,16 +246,19 @@ class LevelReceiver:
     
     def _receive_loop(self):
         """Background thread to receive level data."""
+        buf = bytearray(1024)  # reused for every packet
         while self._running:
             try:
-                data, addr = self.sock.recvfrom(1024)
-                if len(data) == 16:  # uint32 + 3 floats
-                    seq, left, right, mono = struct.unpack('<Ifff', data)
+                nbytes, addr = self.sock.recvfrom_into(buf)
+                if nbytes == _LEVEL_STRUCT.size:  # uint32 + 3 floats
+                    seq, left, right, mono = _LEVEL_STRUCT.unpack_from(buf)
                     self.seq = seq
                     self.left = left
                     self.right = right
                     self.mono = mono
+                    self._latest = (left, right, mono, seq)
                     self.last_update = time.time()
+                    self.new_data.set()
             except socket.timeout:
                 continue
             except OSError as e:
@@ -190,16 +281,21 @@ class LevelReceiver:
         self._send_unregister()
         
         self._running = False
+        if self._heartbeat_handle is not None:
+            _SCHEDULER.cancel(self._heartbeat_handle)
+            self._heartbeat_handle = None
         if self.sock:
             self.sock.close()
         if self._thread:
             self._thread.join(timeout=2.0)
-        if self._heartbeat_thread:
-            self._heartbeat_thread.join(timeout=2.0)
     
     def get_levels(self):
         """Get current level data as tuple (left, right, mono)."""
         return (self.left, self.right, self.mono)
+    
+    def snapshot(self):
+        """Get (left, right, mono, seq) of one packet, never mixed across packets."""
+        return self._latest
 
 
 # =============================================================================
@@ -213,8 +309,19 @@ class SpectrumReceiver:
         - seq (uint32): Sequence number for loss detection
         - size (uint16): Number of frequency bins
         - bins (float32 * size): Frequency bin values (0-100)
+    
+    Once the first packet from server_ip arrives, the socket is connect()ed to
+    that sender so the kernel drops every other source. connect() pins the
+    server's source port too, so after CONNECT_IDLE_RESET quiet seconds (e.g.
+    server restarted on a new port) the socket is reopened unconnected on the
+    same local port and relearns the sender.
     """
     
+    CONNECT_IDLE_RESET = 5  # seconds without packets before dropping the connect() filter
+    
+    __slots__ = ('server_ip', 'port', 'sock', 'bound_port', '_running', '_thread',
+                 'seq', 'size', 'bins', 'last_update', '_first_packet_logged')
+    
     def __init__(self, server_ip, port=5581):
         self.server_ip = server_ip
         self.port = port
@@ -226,22 +333,29 @@ class SpectrumReceiver:
         # Current spectrum data (thread-safe via GIL for simple reads)
         self.seq = 0
         self.size = 0
-        self.bins = []  # List of frequency bin values
+        self.bins = array.array('f')  # Frequency bin values (float32, host order)
         self.last_update = 0
         self._first_packet_logged = False
 
-    def bind_socket(self):
-        """Bind local UDP socket (call before LevelReceiver registration when ports must be coordinated)."""
-        if self.sock is not None:
-            return self.bound_port
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    @staticmethod
+    def _new_socket():
+        """Unbound UDP socket with the receiver's options."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         if hasattr(socket, 'SO_REUSEPORT'):
             try:
-                self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
             except OSError:
                 pass
-        self.sock.settimeout(1.0)
+        _raise_rcvbuf(sock)
+        sock.settimeout(1.0)
+        return sock
+    
+    def bind_socket(self):
+        """Bind local UDP socket (call before LevelReceiver registration when ports must be coordinated)."""
+        if self.sock is not None:
+            return self.bound_port
+        self.sock = self._new_socket()
         try:
             self.sock.bind(('', self.port))
         except OSError:
@@ -263,27 +377,82 @@ class SpectrumReceiver:
         self._thread.start()
         print(f"Spectrum receiver started on UDP port {self.bound_port}")
     
+    def _reopen_unconnected(self):
+        """Replace the connected socket with an unconnected one on the same local port.
+        
+        The new socket is bound before the old one is closed, so a failed bind
+        (port taken in the meantime) leaves the connected socket in service.
+        
+        :return: True if the socket was replaced
+        """
+        sock = self._new_socket()
+        try:
+            sock.bind(('', self.bound_port))
+        except (OSError, TypeError) as e:
+            sock.close()
+            log_client(f"Spectrum: cannot reopen UDP port {self.bound_port}: {e}", "verbose", "network")
+            return False
+        if not self._running:
+            sock.close()
+            return False
+        old = self.sock
+        self.sock = sock
+        # stop() may have run since the check above and closed only the old socket
+        if not self._running:
+            sock.close()
+        if old is not None:
+            try:
+                old.close()
+            except OSError:
+                pass
+        log_client("Spectrum: no packets, listening for any sender again", "verbose", "network")
+        return True
+    
     def _receive_loop(self):
         """Background thread to receive spectrum data."""
+        buf = bytearray(1024)  # reused for every packet
+        view = memoryview(buf)
+        connected = False
+        idle = 0
         while self._running:
             try:
-                data, addr = self.sock.recvfrom(1024)
+                try:
+                    nbytes, addr = self.sock.recvfrom_into(buf)
+                except socket.timeout:
+                    if connected:
+                        idle += 1
+                        if idle >= self.CONNECT_IDLE_RESET:
+                            idle = 0
+                            # On failure stay connected and retry next idle cycle
+                            connected = not self._reopen_unconnected()
+                    continue
+                idle = 0
                 source_ip = addr[0]
                 
-                # FILTER: Only accept packets from our configured server
-                # This prevents interference from other Volumio instances on the network
-                if source_ip != self.server_ip:
-                    continue
+                if not connected:
+                    # FILTER: Only accept packets from our configured server
+                    # This prevents interference from other Volumio instances on the network
+                    if source_ip != self.server_ip:
+                        continue
+                    # From now on let the kernel drop other senders
+                    self.sock.connect(addr)
+                    connected = True
+                    log_client(f"Spectrum: filtering to sender {addr[0]}:{addr[1]}", "verbose", "network")
                 
-                if len(data) >= 6:  # Minimum: uint32 + uint16
+                if nbytes >= _SPECTRUM_HEADER.size:  # Minimum: uint32 + uint16
                     # Unpack header
-                    seq, size = struct.unpack('<IH', data[:6])
-                    expected_len = 6 + (size * 4)  # header + bins (float32 each)
+                    seq, size = _SPECTRUM_HEADER.unpack_from(buf)
+                    expected_len = _SPECTRUM_HEADER.size + (size * 4)  # header + bins (float32 each)
                     
-                    if len(data) >= expected_len:
-                        # Unpack bins
-                        fmt = '<' + str(size) + 'f'
-                        bins = list(struct.unpack(fmt, data[6:expected_len]))
+                    if nbytes >= expected_len:
+                        # Copy the float32 payload straight into a C array
+                        # (no per-bin Python float objects at packet rate).
+                        # A fresh array per packet: get_bins() hands out views
+                        # of it, so it is never modified once published.
+                        bins = array.array('f')
+                        bins.frombytes(view[_SPECTRUM_HEADER.size:expected_len])
+                        if sys.byteorder != 'little':
+                            bins.byteswap()
                         
                         self.seq = seq
                         self.size = size
@@ -296,9 +465,11 @@ class SpectrumReceiver:
                             log_client(f"Spectrum: first packet from {source_ip}, {size} bins", "basic")
                             self._first_packet_logged = True
                         
-                        # Trace log each packet (high volume - only when trace_spectrum enabled)
-                        log_client(f"Spectrum: seq={seq}, bins={size}, max={max(bins):.1f}", 
-                                   "trace", "spectrum")
+                        # Trace log each packet (high volume - only when trace_spectrum enabled;
+                        # checked first so max() and formatting are skipped otherwise)
+                        if log_enabled('trace', 'spectrum'):
+                            log_client(f"Spectrum: seq={seq}, bins={size}, max={max(bins, default=0):.1f}",
+                                       "trace", "spectrum")
                             
             except socket.timeout:
                 continue
@@ -335,24 +506,27 @@ class SpectrumReceiver:
         
         Returns raw bytes matching the pipe format (int32 per bin, little-endian).
         """
-        if not self.bins:
+        bins = self.bins
+        if not bins:
             return None
         
         # Convert float bins back to int32 bytes (same format as pipe)
-        result = bytearray()
-        for val in self.bins:
-            int_val = int(val) & 0xFFFFFFFF
-            result.extend([
-                int_val & 0xFF,
-                (int_val >> 8) & 0xFF,
-                (int_val >> 16) & 0xFF,
-                (int_val >> 24) & 0xFF
-            ])
-        return bytes(result)
+        try:
+            ints = array.array('i', map(int, bins))
+        except OverflowError:
+            # Out of int32 range: wrap like the pipe's 32-bit values
+            ints = array.array('I', [int(v) & 0xFFFFFFFF for v in bins])
+        if sys.byteorder != 'little':
+            ints.byteswap()
+        return ints.tobytes()
     
     def get_bins(self):
-        """Get current spectrum bins as list of floats."""
-        return self.bins.copy() if self.bins else []
+        """Get current spectrum bins as a read-only float sequence (no copy).
+        
+        The receive thread publishes a fresh array per packet and never changes
+        one afterwards, so the view stays consistent; call .tolist() for a list.
+        """
+        return memoryview(self.bins).toreadonly()
     
     def has_data(self):
         """Check if we've received any spectrum data."""
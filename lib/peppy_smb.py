@@ -6,7 +6,9 @@ Mounts Volumio's template share for remote template access.
 """
 
 import os
+import re
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from peppy_common import (
@@ -15,6 +17,14 @@ from peppy_common import (
     _is_ip_address,
 )
 
+
+def _unescape_mountinfo(field):
+    """Decode the octal escapes (\\040 etc.) used in /proc/self/mountinfo paths."""
+    if '\\' not in field:
+        return field
+    return re.sub(r'\\([0-7]{3})', lambda m: chr(int(m.group(1), 8)), field)
+
+
 class SMBMount:
     """Manages SMB mount for remote templates."""
     
@@ -57,36 +67,93 @@ class SMBMount:
             self._mounted = True
             return True
         
-        # Try SMB versions from oldest/fastest to newest (Linux cifs 3.x can be slow)
-        # Order: 2.0, 2.1, 3.0, 3.1.1
+        # SMB versions from oldest/fastest to newest (Linux cifs 3.x can be slow),
+        # each as guest then with volumio credentials
         vers_list = ['2.0', '2.1', '3.0', '3.1.1']
+        candidates = []
         for vers in vers_list:
-            opts_guest = f'guest,ro,nofail,vers={vers}'
-            opts_creds = f'user=volumio,password=volumio,ro,nofail,vers={vers}'
+            candidates.append((vers, 'as guest', f'guest,ro,nofail,vers={vers}'))
+            candidates.append((vers, 'with volumio credentials',
+                               f'user=volumio,password=volumio,ro,nofail,vers={vers}'))
+        
+        # Usual case: SMB 2.0 as guest works, mount it directly
+        vers, how, opts = candidates[0]
+        print(f"Mounting {self.share_path} at {self.mount_point} (SMB {vers})...")
+        result = self._run_mount(self.mount_point, opts)
+        if result.returncode == 0:
+            print(f"  Mounted {how} (SMB {vers})")
+            self._mounted = True
+            return True
+        last_err = result.stderr
+        
+        # Otherwise probe the rest in two parallel rounds (SMB 2.x, then 3.x).
+        # Rounds run in list order and the lowest-index success of a round
+        # wins, so the result is the first candidate that works, as when
+        # they were tried one by one.
+        for group in (candidates[1:4], candidates[4:]):
+            winner, err = self._probe_mount_options(group)
+            last_err = err or last_err
+            if winner is None:
+                continue
+            vers, how, opts = winner
             print(f"Mounting {self.share_path} at {self.mount_point} (SMB {vers})...")
-            result = subprocess.run(
-                ['sudo', 'mount', '-t', 'cifs', self.share_path, str(self.mount_point),
-                 '-o', opts_guest],
-                capture_output=True, text=True,
-                encoding='utf-8', errors='replace'
-            )
+            result = self._run_mount(self.mount_point, opts)
             if result.returncode == 0:
-                print(f"  Mounted as guest (SMB {vers})")
+                print(f"  Mounted {how} (SMB {vers})")
                 self._mounted = True
                 return True
-            result = subprocess.run(
-                ['sudo', 'mount', '-t', 'cifs', self.share_path, str(self.mount_point),
-                 '-o', opts_creds],
-                capture_output=True, text=True,
-                encoding='utf-8', errors='replace'
-            )
-            if result.returncode == 0:
-                print(f"  Mounted with volumio credentials (SMB {vers})")
-                self._mounted = True
-                return True
-        print(f"  Failed to mount (tried SMB {', '.join(vers_list)}): {result.stderr}")
+            last_err = result.stderr
+        print(f"  Failed to mount (tried SMB {', '.join(vers_list)}): {last_err}")
         return False
     
+    def _run_mount(self, target, opts):
+        """Run one cifs mount of the share onto target."""
+        return subprocess.run(
+            ['sudo', 'mount', '-t', 'cifs', self.share_path, str(target), '-o', opts],
+            capture_output=True, text=True,
+            encoding='utf-8', errors='replace'
+        )
+    
+    def _probe_mount_options(self, candidates):
+        """Try (vers, how, opts) candidates concurrently, each on its own scratch dir.
+        
+        Mounting several versions onto the real mount point at once could stack
+        mounts, so every probe mounts a private directory next to it and unmounts
+        again; only the winning options are then mounted for real. All probes
+        are waited for, so no scratch mount outlives this call.
+        
+        :return: (lowest-index successful candidate or None, last error text)
+        """
+        def probe(index, candidate):
+            scratch = self.mount_point.parent / f"{self._probe_prefix}{index}"
+            try:
+                scratch.mkdir(parents=True, exist_ok=True)
+                result = self._run_mount(scratch, candidate[2])
+                if result.returncode == 0:
+                    umount = subprocess.run(['sudo', 'umount', str(scratch)],
+                                            capture_output=True, timeout=10)
+                    if umount.returncode != 0:
+                        # Detach it anyway so the scratch dir can be removed
+                        subprocess.run(['sudo', 'umount', '-l', str(scratch)],
+                                       capture_output=True, timeout=10)
+                return result.returncode == 0, result.stderr
+            except Exception as e:
+                return False, str(e)
+            finally:
+                try:
+                    scratch.rmdir()
+                except OSError:
+                    pass
+        
+        with ThreadPoolExecutor(max_workers=len(candidates)) as pool:
+            results = list(pool.map(probe, range(len(candidates)), candidates))
+        last_err = ''
+        for candidate, (ok, err) in zip(candidates, results):
+            if ok:
+                return candidate, last_err
+            last_err = err or last_err
+        return None, last_err
+    
     def unmount(self):
         """Unmount the SMB share."""
         if self._mounted and self._is_mounted():
@@ -94,19 +161,41 @@ class SMBMount:
                          capture_output=True)
             self._mounted = False
     
-    def _is_mounted(self):
-        """Check if the mount point is currently mounted."""
+    @property
+    def _probe_prefix(self):
+        """Name prefix of the scratch dirs _probe_mount_options mounts next to the mount point."""
+        return f".{self.mount_point.name}-probe"
+    
+    def _is_mounted(self, path=None):
+        """Check if the mount point (or another path) is currently mounted.
+        
+        On Linux this reads the kernel mount table instead of forking
+        mountpoint(1), and never stats the mount point itself, so a hung or
+        stale CIFS server cannot block the check.
+        """
+        mount_point = os.path.abspath(str(path if path is not None else self.mount_point))
+        # Resolve symlinks in the (local) parent only, never in the mount itself
+        target = os.path.join(os.path.realpath(os.path.dirname(mount_point)),
+                              os.path.basename(mount_point))
         try:
-            result = subprocess.run(['mountpoint', '-q', str(self.mount_point)], timeout=5)
-            return result.returncode == 0
-        except subprocess.TimeoutExpired:
-            # Timeout usually means stale mount
+            with open('/proc/self/mountinfo', 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    fields = line.split(' ', 5)
+                    # Field 5 is the mount point, with octal escapes (\040 = space)
+                    if len(fields) > 4 and _unescape_mountinfo(fields[4]) == target:
+                        return True
             return False
-        except Exception:
+        except OSError:
+            pass
+        try:
+            return os.path.ismount(target)
+        except OSError:
+            # ESTALE and friends: treat as not (usably) mounted
             return False
     
     def _cleanup_stale_mount(self):
-        """Clean up any stale mounts at the mount point."""
+        """Clean up any stale mounts at the mount point and leftover probe mounts."""
+        self._cleanup_probe_dirs()
         try:
             # Check if mount point exists and might be stale
             if self.mount_point.exists():
@@ -120,6 +209,25 @@ class SMBMount:
         except Exception:
             pass
     
+    def _cleanup_probe_dirs(self):
+        """Unmount and remove scratch dirs left by a probe that was killed mid-mount."""
+        try:
+            leftovers = list(self.mount_point.parent.glob(f"{self._probe_prefix}*"))
+        except OSError:
+            return
+        for scratch in leftovers:
+            if self._is_mounted(scratch):
+                print(f"Cleaning up leftover probe mount at {scratch}...")
+                try:
+                    subprocess.run(['sudo', 'umount', '-l', str(scratch)],
+                                 capture_output=True, timeout=10)
+                except Exception:
+                    pass
+            try:
+                scratch.rmdir()
+            except OSError:
+                pass
+    
     def _force_unmount(self):
         """Force unmount the mount point."""
         try:
@@ -21,6 +21,10 @@ class RemoteSpectrumOutput:
     from the SpectrumReceiver and injecting them directly.
     """
     
+    # update() runs at most ~60 times per second: just under one 60 Hz frame,
+    # so a 60 fps caller's timing jitter is never throttled
+    MIN_UPDATE_INTERVAL_NS = 15_000_000
+    
     def __init__(self, util, meter_config_volumio, screensaver_path, spectrum_receiver, 
                  decay_rate=0.95, spectrum_templates_path=None):
         """Initialize remote spectrum output.
@@ -44,6 +48,22 @@ class RemoteSpectrumOutput:
         self._decay_rate = max(0.5, min(0.99, decay_rate))
         self._spectrum_templates_path = spectrum_templates_path  # Override for local templates
         self._quantized_heights = []  # last drawn step-aligned bar heights
+        self._last_update_ns = 0  # time.monotonic_ns() of the last update() that ran
+        self._dbg_init_warn = False  # 'not initialized' warning already printed
+        # Spectrum canvas in screen coordinates (draw clip), set by start()
+        self.spectrum_canvas_rect = None
+        self.spectrum_clip_rect = None
+        # True once every bar has decayed to zero and been drawn there with no
+        # topping visible; frames without a new packet then skip the bar pass
+        self._at_rest = False
+        # Per-bar engine hooks and components, resolved once in start()
+        self._set_bar_y = None
+        self._set_reflection_y = None
+        self._set_topping_y = None
+        self._bar_comps = []
+        self._topping_comps = []
+        self._max_bar_h = 0  # engine bar height (dirty-rect column height)
+        self._bar_step = 0.0  # engine bar step size (height quantization)
         
         log_client(f"Spectrum decay rate: {self._decay_rate}", "verbose")
         
@@ -104,15 +124,20 @@ class RemoteSpectrumOutput:
                 # Update paths for remote client
                 if 'current' not in sp_config:
                     sp_config['current'] = {}
-                sp_config['current']['base.folder'] = templates_spectrum_path
-                sp_config['current']['spectrum.folder'] = meter_folder
-                # Ensure Spectrum.__init__ loads only the active section.
-                sp_config['current']['spectrum'] = self.s
-                # Update pipe name to avoid error (won't be used since we don't start data source)
-                sp_config['current']['pipe.name'] = '/tmp/myfifosa'
-                
-                with open(spectrum_config_path, 'w') as f:
-                    sp_config.write(f)
+                wanted = {
+                    'base.folder': templates_spectrum_path,
+                    'spectrum.folder': meter_folder,
+                    # Ensure Spectrum.__init__ loads only the active section.
+                    'spectrum': self.s,
+                    # Update pipe name to avoid error (won't be used since we don't start data source)
+                    'pipe.name': '/tmp/myfifosa',
+                }
+                current = sp_config['current']
+                # Rewrite only when something changed (same meter restart is common)
+                if any(current.get(k) != v for k, v in wanted.items()):
+                    current.update(wanted)
+                    with open(spectrum_config_path, 'w') as f:
+                        sp_config.write(f)
             
             # Change to spectrum path to find config
             original_cwd = os.getcwd()
@@ -154,82 +179,92 @@ class RemoteSpectrumOutput:
                 self.sp.set_toppings()
                 self.sp.set_foreground()
                 self.sp.init_variables()
-                
-                # CRITICAL: Offset all component positions by spectrum.pos from meters.txt
-                # The spectrum renders with coordinates relative to its own canvas (0,0)
-                # but we need to position it within the meter layout
-                pos_x, pos_y = self.pos
-                if pos_x != 0 or pos_y != 0:
-                    for comp in self.sp.components:
-                        if hasattr(comp, 'content_x'):
-                            comp.content_x += pos_x
-                        if hasattr(comp, 'content_y'):
-                            comp.content_y += pos_y
-                    print(f"[RemoteSpectrum] Applied position offset: ({pos_x}, {pos_y})")
-                
-                # Restore original screen_rect (full screen) - Spectrum.__init__ overwrote it
-                if original_screen_rect is not None:
-                    self.util.screen_rect = original_screen_rect
-                else:
-                    # Set to full screen if wasn't set before
-                    from configfileparser import SCREEN_INFO, WIDTH, HEIGHT
-                    screen_w = self.util.meter_config[SCREEN_INFO][WIDTH]
-                    screen_h = self.util.meter_config[SCREEN_INFO][HEIGHT]
-                    self.util.screen_rect = pg.Rect(0, 0, screen_w, screen_h)
-                
-                # Spectrum draw/clean bounds: meters.txt spectrum.size canvas only.
-                # Do NOT extend upward by bar height — that overlaps time/metadata UI above.
-                spectrum_x = self.sp.spectrum_configs[0].get('spectrum.x', 0)
-                spectrum_y = self.sp.spectrum_configs[0].get('spectrum.y', 0)
-                self.spectrum_canvas_rect = pg.Rect(
-                    int(spectrum_x + pos_x), int(spectrum_y + pos_y),
-                    int(self.w), int(self.h))
-                self.spectrum_clip_rect = self.spectrum_canvas_rect
-                
-                # Set run flag but DON'T start data source (we feed via network)
-                self.sp.run_flag = True
-                # NOT calling: self.sp.start_data_source()
-                
-                # Client-side: start from zero and wait for new spectrum data (avoids ghosted full bars
-                # when meter/spectrum changes; decay + server data will drive bars)
-                n_bars = len(self.sp._prev_bar_heights) if (hasattr(self.sp, '_prev_bar_heights') and self.sp._prev_bar_heights) else (len(self.sp.components) - 1 if self.sp.components else int(self.sp.config.get('size', 30)))
-                n_bars = max(1, n_bars)
-                self._local_bins = [0.0] * n_bars
-                self._quantized_heights = [0.0] * n_bars
-                # Force-draw all bars at 0 so set_bars() full height is never shown (no full-value bar / ghost)
-                if hasattr(self.sp, '_prev_bar_heights') and self.sp._prev_bar_heights:
-                    for i in range(min(n_bars, len(self.sp._prev_bar_heights))):
-                        self.sp._prev_bar_heights[i] = 999.0  # Bypass set_bar_y skip (prev==0 would skip)
-                for i in range(n_bars):
-                    idx = i + 1
-                    try:
-                        self.sp.set_bar_y(idx, 0.0)
-                        if hasattr(self.sp, 'set_reflection_y'):
-                            self.sp.set_reflection_y(idx, 0.0)
-                        if hasattr(self.sp, 'set_topping_y'):
-                            self.sp.set_topping_y(idx, 0.0)
-                    except Exception:
-                        pass
-                
-                self._initialized = True
-                
             finally:
+                # Only the engine's own config/template loading needs the spectrum
+                # dir as cwd; restore it before the remote-side setup below
                 os.chdir(original_cwd)
-                
+            
+            # CRITICAL: Offset all component positions by spectrum.pos from meters.txt
+            # The spectrum renders with coordinates relative to its own canvas (0,0)
+            # but we need to position it within the meter layout
+            pos_x, pos_y = self.pos
+            if pos_x != 0 or pos_y != 0:
+                for comp in self.sp.components:
+                    if hasattr(comp, 'content_x'):
+                        comp.content_x += pos_x
+                    if hasattr(comp, 'content_y'):
+                        comp.content_y += pos_y
+                print(f"[RemoteSpectrum] Applied position offset: ({pos_x}, {pos_y})")
+            
+            # Restore original screen_rect (full screen) - Spectrum.__init__ overwrote it
+            if original_screen_rect is not None:
+                self.util.screen_rect = original_screen_rect
+            else:
+                # Set to full screen if wasn't set before
+                from configfileparser import SCREEN_INFO, WIDTH, HEIGHT
+                screen_w = self.util.meter_config[SCREEN_INFO][WIDTH]
+                screen_h = self.util.meter_config[SCREEN_INFO][HEIGHT]
+                self.util.screen_rect = pg.Rect(0, 0, screen_w, screen_h)
+            
+            # Spectrum draw/clean bounds: meters.txt spectrum.size canvas only.
+            # Do NOT extend upward by bar height — that overlaps time/metadata UI above.
+            spectrum_x = self.sp.spectrum_configs[0].get('spectrum.x', 0)
+            spectrum_y = self.sp.spectrum_configs[0].get('spectrum.y', 0)
+            self.spectrum_canvas_rect = pg.Rect(
+                int(spectrum_x + pos_x), int(spectrum_y + pos_y),
+                int(self.w), int(self.h))
+            self.spectrum_clip_rect = self.spectrum_canvas_rect
+            
+            # Set run flag but DON'T start data source (we feed via network)
+            self.sp.run_flag = True
+            # NOT calling: self.sp.start_data_source()
+            
+            # Client-side: start from zero and wait for new spectrum data (avoids ghosted full bars
+            # when meter/spectrum changes; decay + server data will drive bars)
+            n_bars = len(self.sp._prev_bar_heights) if (hasattr(self.sp, '_prev_bar_heights') and self.sp._prev_bar_heights) else (len(self.sp.components) - 1 if self.sp.components else int(self.sp.config.get('size', 30)))
+            n_bars = max(1, n_bars)
+            self._local_bins = [0.0] * n_bars
+            self._quantized_heights = [0.0] * n_bars
+            self._cache_bar_refs(n_bars)
+            self._at_rest = False
+            # Force-draw all bars at 0 so set_bars() full height is never shown (no full-value bar / ghost)
+            # (one-off, here only: per frame, set_bar_y's own prev==new skip is
+            # what keeps unchanged bars cheap, so it is never bypassed in update())
+            prev_heights = getattr(self.sp, '_prev_bar_heights', None)
+            if prev_heights:
+                n_prev = min(n_bars, len(prev_heights))
+                prev_heights[:n_prev] = [999.0] * n_prev  # Bypass set_bar_y skip (prev==0 would skip)
+            for idx in range(1, n_bars + 1):
+                try:
+                    self._set_bar_y(idx, 0.0)
+                    if self._set_reflection_y is not None:
+                        self._set_reflection_y(idx, 0.0)
+                    if self._set_topping_y is not None:
+                        self._set_topping_y(idx, 0.0)
+                except Exception:
+                    pass
+            
+            self._initialized = True
+            
         except Exception as e:
             print(f"[RemoteSpectrum] Failed to initialize: {e}")
             import traceback
             traceback.print_exc()
             self.sp = None
     
-    def _quantize_height(self, height):
-        """Snap bar height to engine step size (segmented bar images need integer steps)."""
-        if height <= 0:
-            return 0.0
-        step = float(getattr(self.sp, 'step', 0) or 0)
+    @staticmethod
+    def _quantize_heights(heights, step):
+        """Snap bar heights to engine step size (segmented bar images need integer steps).
+        
+        One comprehension for all bars rather than a function call per bar.
+        
+        :param heights: Bar heights
+        :param step: Engine step size (float; <= 0 means whole pixels)
+        :return: List of quantized heights (floats, 0.0 for non-positive input)
+        """
         if step <= 0:
-            return float(int(height))
-        return float(int(height / step) * step)
+            return [float(int(h)) if h > 0 else 0.0 for h in heights]
+        return [float(int(h / step) * step) if h > 0 else 0.0 for h in heights]
 
     @staticmethod
     def _bar_dirty_rect(comp, old_content_y, max_bar_height):
@@ -255,36 +290,63 @@ class RemoteSpectrumOutput:
             return self.sp.components[idx]
         return None
 
+    def _cache_bar_refs(self, n_bars):
+        """Resolve the engine's per-bar setters and components once, not per frame.
+        
+        :param n_bars: Number of spectrum bars
+        """
+        sp = self.sp
+        self._max_bar_h = int(getattr(sp, 'height', 0) or 0)
+        self._bar_step = float(getattr(sp, 'step', 0) or 0)
+        self._set_bar_y = sp.set_bar_y
+        self._set_reflection_y = getattr(sp, 'set_reflection_y', None)
+        self._set_topping_y = getattr(sp, 'set_topping_y', None)
+        comps = sp.components
+        self._bar_comps = [comps[idx] if idx < len(comps) else None
+                           for idx in range(1, n_bars + 1)]
+        try:
+            self._topping_comps = [self._topping_component(idx)
+                                   for idx in range(1, n_bars + 1)]
+        except AttributeError:
+            self._topping_comps = [None] * n_bars
+
     def update(self):
         """Update spectrum from network data and render."""
         dirty_rects = []
         if not self._initialized or self.sp is None:
-            if not hasattr(self, '_dbg_init_warn'):
+            if not self._dbg_init_warn:
                 print(f"[RemoteSpectrum] update: not initialized={not self._initialized}, sp={self.sp}")
                 self._dbg_init_warn = True
             return dirty_rects
         
+        # Frame budget: a faster caller would only burn CPU on extra decay steps
+        now = time.monotonic_ns()
+        if now - self._last_update_ns < self.MIN_UPDATE_INTERVAL_NS:
+            return dirty_rects
+        self._last_update_ns = now
+        
         # Get bar heights from network
         bins = self.spectrum_receiver.get_bins()
         current_seq = self.spectrum_receiver.seq
         
-        # Fallback init if start() didn't set _local_bins (e.g. older code path)
-        if self._local_bins is None and hasattr(self.sp, '_prev_bar_heights') and self.sp._prev_bar_heights:
-            self._local_bins = [0.0] * len(self.sp._prev_bar_heights)
-        
+        # start() sets _local_bins before marking the output initialized
         if not self._local_bins:
             return dirty_rects
         
         # Check if we have new packet data
         new_packet = bins and current_seq != self._last_packet_seq
         
+        if self._at_rest and not new_packet:
+            # Silence: nothing to decay and no bar or topping can move
+            return self._draw(dirty_rects, False)
         
         # SMOOTH ANIMATION LOGIC:
         # 1. Always decay local bins (bars fall naturally)
         # 2. Only push bars UP when server sends genuinely NEW higher values
         # 3. Ignore repeated/stale server data so decay can work
         
-        _prev_len = len(self.sp._prev_bar_heights) if (hasattr(self.sp, '_prev_bar_heights') and self.sp._prev_bar_heights) else len(self._local_bins)
+        prev_heights = getattr(self.sp, '_prev_bar_heights', None)
+        _prev_len = len(prev_heights) if prev_heights else len(self._local_bins)
         num_bars = min(len(self._local_bins), _prev_len)
         
         # Freshness gating by packet sequence is more reliable than value-diff threshold.
@@ -292,87 +354,104 @@ class RemoteSpectrumOutput:
         
         # Client-side: ignore "all bars at max" packet (pre-FFT after spectrum reinit); decay and wait for real data
         if bins and len(bins) >= 2:
+            # Every bin within 2 of the peak <=> peak - trough <= 2 (two C-level reductions)
             mx = max(bins)
-            if mx > 50 and all(abs(b - mx) <= 2 for b in bins):
+            if mx > 50 and mx - min(bins) <= 2:
                 # Treat as pre-FFT full-height burst: zero and don't apply this packet
-                for i in range(num_bars):
-                    if i < len(self._local_bins):
-                        self._local_bins[i] *= self._decay_rate
-                        if self._local_bins[i] < 0.5:
-                            self._local_bins[i] = 0.0
+                self._local_bins[:num_bars] = [
+                    v if v >= 0.5 else 0.0
+                    for v in map(self._decay_rate.__mul__, self._local_bins[:num_bars])]
                 bins = None  # Skip Step 2 so we don't push full values into _local_bins
         
         # Step 1: Apply decay to all local bins (ALWAYS)
-        for i in range(num_bars):
-            self._local_bins[i] *= self._decay_rate
-            if self._local_bins[i] < 0.5:
-                self._local_bins[i] = 0
-        
         # Step 2: Only use server data when packet is NEW and values are HIGHER
+        # Both run as one pass over the bins that have server data; any bars
+        # beyond the packet (or all bars, with no new packet) only decay.
+        local = self._local_bins
+        decayed = map(self._decay_rate.__mul__, local[:num_bars])
+        num_to_copy = 0
         if bins and server_data_changed:
             num_to_copy = min(len(bins), num_bars)
-            for i in range(num_to_copy):
-                server_val = bins[i]
-                if server_val > self._local_bins[i]:
-                    self._local_bins[i] = server_val  # Instant rise to peak
+            # Instant rise to peak: max of the decayed local bin and the server bin
+            local[:num_to_copy] = [max(v if v >= 0.5 else 0.0, server_val)
+                                   for server_val, v in zip(bins[:num_to_copy], decayed)]
             self._last_packet_seq = current_seq
+        # zip() stops on the server slice first, so decayed resumes at bar num_to_copy
+        local[num_to_copy:num_bars] = [v if v >= 0.5 else 0.0 for v in decayed]
         
         # Step 3: Update visual components (no fade-in; follow server data + decay)
         if len(self._quantized_heights) < num_bars:
             self._quantized_heights.extend(
                 [0.0] * (num_bars - len(self._quantized_heights)))
-        max_bar_h = int(getattr(self.sp, 'height', 0) or 0)
+        if len(self._bar_comps) < num_bars:
+            self._cache_bar_refs(num_bars)
+        max_bar_h = self._max_bar_h
+        bar_heights = self._quantize_heights(local[:num_bars], self._bar_step)
+        set_bar_y = self._set_bar_y
+        set_reflection_y = self._set_reflection_y
+        set_topping_y = self._set_topping_y
+        bar_comps = self._bar_comps
+        topping_comps = self._topping_comps
+        quantized = self._quantized_heights
         any_topping_active = False
         for i in range(num_bars):
-            bar_height = self._quantize_height(self._local_bins[i])
+            bar_height = bar_heights[i]
             idx = i + 1  # 1-based index for Spectrum methods
-            prev_height = self._quantized_heights[i]
-            bar_changed = abs(bar_height - prev_height) >= 1
-            comp = self.sp.components[idx] if idx < len(self.sp.components) else None
-            old_content_y = comp.content_y if comp is not None else None
 
-            if bar_changed:
-                self._quantized_heights[i] = bar_height
+            if abs(bar_height - quantized[i]) >= 1:
+                quantized[i] = bar_height
+                comp = bar_comps[i]
+                old_content_y = comp.content_y if comp is not None else None
                 try:
-                    self.sp.set_bar_y(idx, bar_height)
+                    set_bar_y(idx, bar_height)
                     if comp is not None and max_bar_h > 0 and self.sp._dirty_rects:
                         self.sp._dirty_rects[-1] = self._bar_dirty_rect(
                             comp, old_content_y, max_bar_h)
-                    if hasattr(self.sp, 'set_reflection_y'):
-                        self.sp.set_reflection_y(idx, bar_height)
+                    if set_reflection_y is not None:
+                        set_reflection_y(idx, bar_height)
                 except Exception:
                     pass
 
             # Peak-hold toppings rely on repeated calls with a stable bar height
             # (host pipe loop calls set_topping_y even when set_bar_y skips).
-            try:
-                if hasattr(self.sp, 'set_topping_y'):
-                    self.sp.set_topping_y(idx, bar_height)
-                    topping = self._topping_component(idx)
+            if set_topping_y is not None:
+                try:
+                    set_topping_y(idx, bar_height)
+                    topping = topping_comps[i]
                     if topping is not None and topping.visible:
                         any_topping_active = True
-            except Exception:
-                pass
+                except Exception:
+                    pass
+        
+        self._at_rest = not any_topping_active and not any(local[:num_bars])
+        return self._draw(dirty_rects, any_topping_active)
+    
+    def _draw(self, dirty_rects, any_topping_active):
+        """Draw the spectrum into its canvas and return the dirty rects.
         
+        :param dirty_rects: List to extend with the areas drawn
+        :param any_topping_active: Redraw the whole canvas (peak toppings moved)
+        """
         # Draw spectrum (without display.update - parent handles that)
         try:
-            import pygame as pg
-            prev_clip = self.util.pygame_screen.get_clip()
-            clip_rect = getattr(self, 'spectrum_canvas_rect', None)
-            if clip_rect is None:
-                clip_rect = getattr(self, 'spectrum_clip_rect', self.util.screen_rect)
-            self.util.pygame_screen.set_clip(clip_rect)
+            screen = self.util.pygame_screen
+            # The host loop may clip too, so its current clip is read, not cached
+            prev_clip = screen.get_clip()
+            clip_rect = self.spectrum_clip_rect  # set by start() before _initialized
+            screen.set_clip(clip_rect)
 
             bar_dirty = [r.copy() for r in self.sp._dirty_rects if r] if self.sp._dirty_rects else []
             if any_topping_active:
                 self.sp.draw_area(clip_rect)
                 dirty_rects.append(clip_rect.copy())
             elif bar_dirty:
-                for rect in bar_dirty:
-                    clipped = rect.clip(clip_rect)
-                    if clipped.width > 0 and clipped.height > 0:
-                        self.sp.draw_area(clipped)
-                dirty_rects.extend(bar_dirty)
+                # Moved bars are neighbouring columns: restore their union in
+                # one draw_area call instead of one call per bar
+                union = bar_dirty[0].unionall(bar_dirty[1:]) if len(bar_dirty) > 1 else bar_dirty[0]
+                clipped = union.clip(clip_rect)
+                if clipped.width > 0 and clipped.height > 0:
+                    self.sp.draw_area(clipped)
+                dirty_rects.append(union)
 
             self.sp._dirty_rects = []
             self.sp.draw()
@@ -380,7 +459,7 @@ class RemoteSpectrumOutput:
             if not dirty_rects and clip_rect:
                 dirty_rects.append(clip_rect.copy())
 
-            self.util.pygame_screen.set_clip(prev_clip)
+            screen.set_clip(prev_clip)
         except Exception:
             pass  # Silently handle draw errors
         
@@ -394,7 +473,10 @@ class RemoteSpectrumOutput:
             except Exception:
                 pass
         self._initialized = False
+        self._at_rest = False
         self._quantized_heights = []
+        self._bar_comps = []
+        self._topping_comps = []
     
     def get_current_bins(self):
         """Get current bar heights (for compatibility)."""
@@ -8,6 +8,7 @@ Shows blocking pygame UI on mismatch.
 
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from peppy_common import (
     __version__,
@@ -61,13 +62,21 @@ def wait_for_server_plugin_version(server_info, config_fetcher, timeout_sec=SERV
     print(f"Waiting for Volumio / PeppyMeter at {label} ({ip})... (up to {int(timeout_sec)}s)")
     log_client(f"Waiting for server HTTP (plugin version), timeout={timeout_sec}s", "basic")
 
+    # Fetch on a worker thread so the waiting window keeps redrawing and
+    # stays closable while a request sits in its (up to 10s) HTTP timeout.
+    executor = ThreadPoolExecutor(max_workers=1)
+    pending = None
+
     try:
         while time.time() < deadline:
             now = time.time()
-            if now >= next_fetch:
+            if pending is None and now >= next_fetch:
                 attempt += 1
                 next_fetch = now + SERVER_RETRY_INTERVAL_SEC
-                ok, _, _ = config_fetcher.fetch()
+                pending = executor.submit(config_fetcher.fetch)
+            if pending is not None and pending.done():
+                ok, _, _ = pending.result()
+                pending = None
                 if ok:
                     pv = (getattr(config_fetcher, 'cached_plugin_version', None) or '').strip()
                     if pv:
@@ -93,7 +102,8 @@ def wait_for_server_plugin_version(server_info, config_fetcher, timeout_sec=SERV
                     ('', font_body, (220, 220, 230)),
                     ('Starting Volumio or the PeppyMeter plugin can take a minute.', font_body, (200, 200, 210)),
                     ('This window will close when the server answers.', font_body, (200, 200, 210)),
-                    (f'Attempt {attempt}  ·  {max(0, int(deadline - time.time()))}s left', font_hint, (140, 140, 155)),
+                    (f'Attempt {attempt}{"  ·  connecting..." if pending is not None else ""}'
+                     f'  ·  {max(0, int(deadline - time.time()))}s left', font_hint, (140, 140, 155)),
                 )
                 for text, font, color in rows:
                     if text:
@@ -108,6 +118,8 @@ def wait_for_server_plugin_version(server_info, config_fetcher, timeout_sec=SERV
         print('Timed out waiting for server HTTP.')
         return 'timeout', None
     finally:
+        # Do not wait for a fetch still stuck in its timeout
+        executor.shutdown(wait=False)
         if use_pygame and pygame_mod is not None:
             try:
                 pygame_mod.quit()
@@ -7,8 +7,10 @@ Profile manager landing page with new/edit/rename/delete/import/export.
 New profiles: linear step wizard. Edit profiles: tabbed section view.
 """
 
+import functools
 import json
 import os
+import queue
 import sys
 import threading
 
@@ -72,9 +74,54 @@ def _center_window(root, w, h):
 
 
 def _clear_frame(frame):
-    """Destroy all children of a frame."""
+    """Destroy all children of a frame (a kept profile manager page is only hidden)."""
+    kept = getattr(frame, '_profile_manager', None)
+    kept_page = kept[0] if kept else None
     for child in frame.winfo_children():
-        child.destroy()
+        if child is kept_page:
+            child.pack_forget()
+        else:
+            child.destroy()
+
+
+def _mtime_ns(path):
+    """Return st_mtime_ns for path, or None if it cannot be stat'ed."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_folders(path, mtime_ns):
+    """get_template_folders() memoized on the templates dir mtime."""
+    return tuple(get_template_folders(path))
+
+
+@functools.lru_cache(maxsize=128)
+def _cached_sections(path, folder, mtime_ns):
+    """get_meter_sections() memoized on the meters.txt mtime (deduplicated, order kept)."""
+    return tuple(dict.fromkeys(get_meter_sections(path, folder)))
+
+
+def _template_folders(path):
+    """Template folders under path; rescans only when the directory changes."""
+    mtime_ns = _mtime_ns(path) if path else None
+    if mtime_ns is None:
+        return get_template_folders(path)
+    return list(_cached_folders(path, mtime_ns))
+
+
+def _meter_sections(path, folder):
+    """Meter sections of folder/meters.txt as a tuple; reparses only when the file changes.
+
+    An unchanged file returns the very same cached tuple, so callers can compare
+    against the previous result without walking it.
+    """
+    mtime_ns = _mtime_ns(os.path.join(path, folder, 'meters.txt')) if path and folder else None
+    if mtime_ns is None:
+        return tuple(dict.fromkeys(get_meter_sections(path, folder)))
+    return _cached_sections(path, folder, mtime_ns)
 
 
 # =============================================================================
@@ -169,11 +216,10 @@ def _run_profile_editor(root, main_frame, store, result, profile_id=None):
         if not lb.winfo_exists():
             return
         lb.delete(0, tk.END)
-        discovered.clear()
-        for s in servers_dict.values():
-            discovered.append(s)
-            lb.insert(tk.END, f"{s.get('hostname', s['ip'])} ({s['ip']})")
-        if not discovered:
+        discovered[:] = servers_dict.values()
+        if discovered:
+            lb.insert(tk.END, *(f"{s.get('hostname', s['ip'])} ({s['ip']})" for s in discovered))
+        else:
             lb.insert(tk.END, "No servers found - try manual entry")
         _update_discovery_choice_visibility()
 
@@ -199,16 +245,27 @@ def _run_profile_editor(root, main_frame, store, result, profile_id=None):
         _on_server_mode_change()
         lb.delete(0, tk.END)
         lb.insert(tk.END, "Searching...")
-        root.update_idletasks()
+        results = queue.Queue()
 
         def do_discovery():
             disc = ServerDiscovery(port=config["server"]["discovery_port"],
-                                  timeout=config["server"]["discovery_timeout"])
-            servers = disc.discover()
-            root.after(0, lambda: _fill_servers_list(servers))
+                                  timeout=config["server"]["discovery_timeout"],
+                                  early_exit_ms=1000)
+            results.put(disc.discover())
+
+        def _poll_discovery():
+            # Worker never touches Tk; the mainloop picks up the result here
+            try:
+                servers = results.get_nowait()
+            except queue.Empty:
+                if lb.winfo_exists():
+                    root.after(50, _poll_discovery)
+                return
+            _fill_servers_list(servers)
 
         t = threading.Thread(target=do_discovery, daemon=True)
         t.start()
+        root.after(50, _poll_discovery)
 
     ttk.Radiobutton(server_frame, text="Auto-discover server (recommended)",
                     variable=server_mode_var, value="auto",
@@ -449,24 +506,57 @@ def _run_profile_editor(root, main_frame, store, result, profile_id=None):
 
     def _refresh_theme_folders():
         path = _theme_templates_path()
-        folders = get_template_folders(path)
+        folders = _template_folders(path)
         folder_combo["values"] = folders
         if folders and not theme_folder_var.get() and theme_mode_var.get() != "server":
             theme_folder_var.set(folders[0])
-        _refresh_theme_meters()
+        _refresh_theme_meters(path)
+
+    shown_sections = {'combo': None, 'listbox': None}
 
-    def _refresh_theme_meters():
+    def _refresh_theme_meters(path=None):
+        # Only the widget the current mode uses is filled; the theme_mode_var
+        # trace fills the other one if the user switches modes.
+        # path: templates path already resolved by the caller, if any.
+        mode = theme_mode_var.get()
+        if mode not in ("fixed", "random_list"):
+            return
         folder = (theme_folder_var.get() or "").strip()
-        path = _theme_templates_path()
-        sections = get_meter_sections(path, folder) if folder else []
-        meter_combo["values"] = sections
-        meter_listbox.delete(0, tk.END)
-        for s in sections:
-            meter_listbox.insert(tk.END, s)
-        if sections and theme_mode_var.get() == "fixed" and not theme_meter_var.get():
-            theme_meter_var.set(sections[0])
-
-    theme_folder_var.trace_add("write", lambda *_: _refresh_theme_meters())
+        if path is None:
+            path = _theme_templates_path()
+        sections = _meter_sections(path, folder) if folder else ()
+        if mode == "fixed":
+            if sections != shown_sections['combo']:
+                meter_combo["values"] = sections
+                shown_sections['combo'] = sections
+            if sections and not theme_meter_var.get():
+                theme_meter_var.set(sections[0])
+        elif sections != shown_sections['listbox']:
+            # Unchanged list keeps the user's multi-selection intact; on a real
+            # change, reselect the entries that survived it
+            kept = {meter_listbox.get(i) for i in meter_listbox.curselection()}
+            meter_listbox.delete(0, tk.END)
+            if sections:
+                meter_listbox.insert(tk.END, *sections)
+                for i, name in enumerate(sections):
+                    if name in kept:
+                        meter_listbox.selection_set(i)
+            shown_sections['listbox'] = sections
+
+    _pending_meter_refresh = [None]
+
+    def _on_theme_folder_change(*_):
+        # Coalesce bursts of writes into one meters.txt scan once the value settles
+        if _pending_meter_refresh[0] is not None:
+            root.after_cancel(_pending_meter_refresh[0])
+        _pending_meter_refresh[0] = root.after(150, _run_pending_meter_refresh)
+
+    def _run_pending_meter_refresh():
+        _pending_meter_refresh[0] = None
+        if meter_listbox.winfo_exists():
+            _refresh_theme_meters()
+
+    theme_folder_var.trace_add("write", _on_theme_folder_change)
     ttk.Label(theme_frame, text="Template folder:", font=('', 9)).pack(anchor=tk.W, pady=(10, 0))
     folder_combo = ttk.Combobox(theme_frame, textvariable=theme_folder_var, width=36, state="readonly")
     folder_combo.pack(anchor=tk.W, fill=tk.X, pady=2)
@@ -478,6 +568,7 @@ def _run_profile_editor(root, main_frame, store, result, profile_id=None):
     meter_combo.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 8))
     meter_listbox = tk.Listbox(meter_row, selectmode=tk.MULTIPLE, height=4, width=24)
     meter_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    theme_mode_var.trace_add("write", lambda *_: _refresh_theme_meters())
     _refresh_theme_folders()
     steps.append(theme_frame)
 
@@ -522,70 +613,71 @@ def _run_profile_editor(root, main_frame, store, result, profile_id=None):
     # Apply functions (shared by both modes)
     # ================================================================
     def apply_server():
+        server = config["server"]
         mode = server_mode_var.get()
         if mode == "hostname":
-            config["server"]["host"] = (hostname_var.get() or "").strip() or None
+            server["host"] = (hostname_var.get() or "").strip() or None
         elif mode == "ip":
-            config["server"]["host"] = (ip_var.get() or "").strip() or None
+            server["host"] = (ip_var.get() or "").strip() or None
         else:
             sel = lb.curselection()
             if sel and discovered and 0 <= sel[0] < len(discovered):
                 s = discovered[sel[0]]
-                config["server"]["host"] = s.get("hostname", s["ip"]) if use_hostname_var.get() else s["ip"]
+                server["host"] = s.get("hostname", s["ip"]) if use_hostname_var.get() else s["ip"]
             else:
-                config["server"]["host"] = None
+                server["host"] = None
         if is_new:
-            config["name"] = (profile_name_var.get() or "").strip() or config["server"]["host"] or "Default"
+            config["name"] = (profile_name_var.get() or "").strip() or server["host"] or "Default"
 
     def apply_display():
-        config["display"]["windowed"] = (display_mode.get() == "windowed")
-        config["display"]["fullscreen"] = (display_mode.get() == "fullscreen")
+        display = config["display"]
+        mode = display_mode.get()
+        display["windowed"] = (mode == "windowed")
+        display["fullscreen"] = (mode == "fullscreen")
 
     def apply_templates():
-        config["templates"]["use_smb"] = use_smb_var.get()
+        templates = config["templates"]
+        templates["use_smb"] = use_smb_var.get()
         lp = (local_path_var.get() or "").strip()
-        config["templates"]["local_path"] = lp if lp else None
+        templates["local_path"] = lp if lp else None
         sp = (spectrum_local_var.get() or "").strip()
-        config["templates"]["spectrum_local_path"] = sp if sp else None
+        templates["spectrum_local_path"] = sp if sp else None
 
     def apply_theme():
+        display = config["display"]
         mode = theme_mode_var.get()
         if mode == "server":
-            config["display"]["meter_folder"] = None
-            config["display"]["meter"] = None
+            display["meter_folder"] = None
+            display["meter"] = None
         else:
             folder = (theme_folder_var.get() or "").strip()
-            config["display"]["meter_folder"] = folder if folder else None
+            display["meter_folder"] = folder if folder else None
             if mode == "random_folder":
-                config["display"]["meter"] = "random"
+                display["meter"] = "random"
             elif mode == "fixed":
-                config["display"]["meter"] = (theme_meter_var.get() or "").strip() or None
+                display["meter"] = (theme_meter_var.get() or "").strip() or None
             else:
                 sel = meter_listbox.curselection()
                 sections = [meter_listbox.get(i) for i in sel] if sel else []
-                config["display"]["meter"] = ",".join(sections) if sections else None
+                display["meter"] = ",".join(sections) if sections else None
 
     def apply_spectrum():
+        spectrum = config.setdefault("spectrum", {})
         try:
             v = float(decay_var.get())
             v = max(0.5, min(0.99, v))
-            if "spectrum" not in config:
-                config["spectrum"] = {}
-            config["spectrum"]["decay_rate"] = v
+            spectrum["decay_rate"] = v
             decay_var.set(str(v))
         except (ValueError, TypeError):
-            if "spectrum" not in config:
-                config["spectrum"] = {}
-            config["spectrum"]["decay_rate"] = 0.95
+            spectrum["decay_rate"] = 0.95
             decay_var.set("0.95")
 
     def apply_debug():
-        if "debug" not in config:
-            config["debug"] = {}
-        config["debug"]["level"] = debug_level_var.get() or "off"
-        config["debug"]["trace_spectrum"] = trace_spectrum_var.get()
-        config["debug"]["trace_network"] = trace_network_var.get()
-        config["debug"]["trace_wizard"] = trace_wizard_var.get()
+        debug = config.setdefault("debug", {})
+        debug["level"] = debug_level_var.get() or "off"
+        debug["trace_spectrum"] = trace_spectrum_var.get()
+        debug["trace_network"] = trace_network_var.get()
+        debug["trace_wizard"] = trace_wizard_var.get()
 
     def apply_all():
         apply_server()
@@ -686,13 +778,29 @@ def _run_profile_editor(root, main_frame, store, result, profile_id=None):
     lbl_warnings.pack(anchor=tk.W, pady=(0, 8))
     steps.append(done_frame)
 
-    # Wraplength update
-    def _update_wraplength(_evt=None):
+    # Wraplength update (coalesced: a resize fires many <Configure> events,
+    # relabel once per idle pass and only when the width actually changed)
+    wrap_pending = [False]
+    wrap_applied = [None]
+
+    def _do_wrap():
+        wrap_pending[0] = False
         w = main_frame.winfo_width()
-        if w > 40:
-            for lbl in wrap_labels:
-                lbl.configure(wraplength=max(80, w - 40))
-            lbl_warnings.configure(wraplength=max(80, w - 40))
+        if w <= 40:
+            return
+        wrap = max(80, w - 40)
+        if wrap == wrap_applied[0]:
+            return
+        wrap_applied[0] = wrap
+        for lbl in wrap_labels:
+            lbl.configure(wraplength=wrap)
+        lbl_warnings.configure(wraplength=wrap)
+
+    def _update_wraplength(_evt=None):
+        if wrap_pending[0]:
+            return
+        wrap_pending[0] = True
+        root.after_idle(_do_wrap)
 
     main_frame.bind('<Configure>', _update_wraplength)
 
@@ -729,34 +837,33 @@ def _run_profile_editor(root, main_frame, store, result, profile_id=None):
 
     last_step = len(steps) - 1
 
+    def _apply_debug_and_validate():
+        apply_debug()
+        warnings = validate_profile_paths(config)
+        if warnings:
+            warnings_var.set("Path warnings:\n" + "\n".join(warnings))
+        else:
+            warnings_var.set("")
+
+    # Per-step handlers, indexed like steps: applied when leaving a step with
+    # Next, and run whenever a step is shown via Next or Back.
+    step_apply = (apply_server, apply_display, apply_templates, apply_theme,
+                  apply_spectrum, _apply_debug_and_validate, None)
+    step_on_enter = (None, None, None, _refresh_theme_folders, None, None, None)
+
+    def _enter_step(i):
+        current_step[0] = i
+        show_step(i)
+        if step_on_enter[i]:
+            step_on_enter[i]()
+
     def next_click():
         i = current_step[0]
-        if i == 0:
-            apply_server()
-        elif i == 1:
-            apply_display()
-        elif i == 2:
-            apply_templates()
-        elif i == 3:
-            apply_theme()
-        elif i == 4:
-            apply_spectrum()
-        elif i == 5:
-            apply_debug()
-            warnings = validate_profile_paths(config)
-            if warnings:
-                warnings_var.set("Path warnings:\n" + "\n".join(warnings))
-            else:
-                warnings_var.set("")
-
+        if step_apply[i]:
+            step_apply[i]()
         if i < last_step:
-            current_step[0] = i + 1
-            show_step(current_step[0])
-            if current_step[0] == 0:
-                discover_servers()
-            elif current_step[0] == 3:
-                _refresh_theme_folders()
-            if current_step[0] == last_step:
+            _enter_step(i + 1)
+            if i + 1 == last_step:
                 btn_next.pack_forget()
                 btn_back.pack(side=tk.RIGHT, padx=4)
                 btn_save_run.pack(side=tk.RIGHT, padx=4)
@@ -765,10 +872,7 @@ def _run_profile_editor(root, main_frame, store, result, profile_id=None):
     def back_click():
         i = current_step[0]
         if i > 0:
-            current_step[0] = i - 1
-            show_step(current_step[0])
-            if current_step[0] == 3:
-                _refresh_theme_folders()
+            _enter_step(i - 1)
             if i == last_step:
                 btn_save_run.pack_forget()
                 btn_save_exit.pack_forget()
@@ -789,20 +893,36 @@ def _run_profile_editor(root, main_frame, store, result, profile_id=None):
 # =============================================================================
 
 def _show_profile_manager(root, main_frame, store, result):
-    """Show the profile manager landing page."""
+    """Show the profile manager landing page.
+
+    The page is built once per window and only hidden while the profile editor
+    is open; coming back to it re-lists the profiles instead of rebuilding it.
+    """
     import tkinter as tk
     from tkinter import ttk, filedialog, messagebox
 
-    _clear_frame(main_frame)
     root.title("PeppyMeter Remote - Profile Manager")
+    # The editor's wraplength handler must not outlive its labels
+    main_frame.unbind('<Configure>')
+    kept = getattr(main_frame, '_profile_manager', None)
+    if kept is not None and kept[0].winfo_exists():
+        page, refresh_kept = kept
+        _clear_frame(main_frame)
+        page.pack(fill=tk.BOTH, expand=True)
+        refresh_kept()
+        return
+
+    _clear_frame(main_frame)
+    page = ttk.Frame(main_frame)
+    page.pack(fill=tk.BOTH, expand=True)
 
-    ttk.Label(main_frame, text="PeppyMeter Remote",
+    ttk.Label(page, text="PeppyMeter Remote",
               font=('', 14, 'bold')).pack(anchor=tk.W, pady=(0, 4))
-    ttk.Label(main_frame, text="Profile Manager",
+    ttk.Label(page, text="Profile Manager",
               font=('', 11)).pack(anchor=tk.W, pady=(0, 12))
 
     # Profile listbox
-    list_frame = ttk.Frame(main_frame)
+    list_frame = ttk.Frame(page)
     list_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 8))
 
     lb = tk.Listbox(list_frame, height=8, selectmode=tk.SINGLE, font=('', 10))
@@ -817,11 +937,14 @@ def _show_profile_manager(root, main_frame, store, result):
         lb.delete(0, tk.END)
         profile_ids.clear()
         active_id = get_active_profile_id(store)
+        rows = []
         for pid, name, host in get_profile_list(store):
             marker = " *" if pid == active_id else "  "
             host_str = f" ({host})" if host else " (auto-discover)"
-            lb.insert(tk.END, f"{marker} {name}{host_str}")
+            rows.append(f"{marker} {name}{host_str}")
             profile_ids.append(pid)
+        if rows:
+            lb.insert(tk.END, *rows)
         if active_id in profile_ids:
             idx = profile_ids.index(active_id)
             lb.selection_set(idx)
@@ -834,7 +957,7 @@ def _show_profile_manager(root, main_frame, store, result):
         return None
 
     # Action buttons
-    action_frame = ttk.Frame(main_frame)
+    action_frame = ttk.Frame(page)
     action_frame.pack(fill=tk.X, pady=(0, 12))
 
     def on_new():
@@ -974,7 +1097,7 @@ def _show_profile_manager(root, main_frame, store, result):
     ttk.Button(action_frame, text="Export", width=bw, command=on_export).grid(row=1, column=2, padx=2, pady=2, sticky='ew')
 
     # Bottom: Start / Cancel
-    bottom = ttk.Frame(main_frame)
+    bottom = ttk.Frame(page)
     bottom.pack(fill=tk.X, side=tk.BOTTOM, pady=(8, 0))
 
     def on_start():
@@ -1001,6 +1124,7 @@ def _show_profile_manager(root, main_frame, store, result):
 
     refresh_list()
     lb.bind('<Double-Button-1>', lambda _: on_edit())
+    main_frame._profile_manager = (page, refresh_list)
 
 
 # =============================================================================
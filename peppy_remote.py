@@ -29,8 +29,8 @@ Usage:
 import argparse
 import json
 import os
+import queue
 import signal
-import socket
 import struct
 import sys
 import tempfile
@@ -63,6 +63,7 @@ from peppy_common import (
     setup_logging,
     init_client_debug,
     log_client,
+    log_enabled,
     load_config,
     is_first_run,
     save_config,
@@ -74,7 +75,7 @@ from peppy_common import (
     save_config_store,
 )
 from peppy_version import check_remote_version_and_exit_if_mismatch
-from peppy_network import ServerDiscovery, ConfigVersionListener, ConfigFetcher
+from peppy_network import ServerDiscovery, ConfigVersionListener, ConfigFetcher, resolve_server_host
 from peppy_persist import PersistManager
 from peppy_receivers import LevelReceiver, SpectrumReceiver, RemoteDataSource
 from peppy_spectrum import RemoteSpectrumOutput
@@ -82,6 +83,7 @@ from peppy_smb import SMBMount
 from peppy_asset import (
     setup_format_icons,
     setup_fonts,
+    prewarm_meter_assets,
     sync_handlers_from_server,
     _patch_handlers_for_local_icons,
     _unc_paths_for_windows,
@@ -90,16 +92,88 @@ from peppy_wizard_cli import run_config_wizard
 from peppy_wizard_gui import can_show_wizard_ui, run_wizard_ui
 
 
+# One scratch ConfigParser per thread for the short-lived lookups below
+_scratch_parsers = threading.local()
+
+
+def _scratch_config_parser():
+    """Return this thread's reusable, emptied ConfigParser.
+
+    Only for helpers that read what they need and return before any other
+    caller can take the parser again (never hold it across another call).
+    """
+    parser = getattr(_scratch_parsers, 'parser', None)
+    if parser is None:
+        import configparser
+        parser = _scratch_parsers.parser = configparser.ConfigParser()
+    else:
+        parser.clear()
+        parser[parser.default_section].clear()
+    return parser
+
+
+# config content -> ('current' meter.folder, meter) or None when unusable;
+# polls mostly return identical content, so skip re-running configparser
+_server_meter_cache = {}
+_SERVER_METER_CACHE_MAX = 4
+
+
+def _server_meter_fields(config_content):
+    """Return (meter.folder, meter) from the [current] section, or None. Cached."""
+    try:
+        return _server_meter_cache[config_content]
+    except KeyError:
+        pass
+    config = _scratch_config_parser()
+    try:
+        config.read_string(config_content)
+    except Exception:
+        fields = None
+    else:
+        if 'current' in config:
+            fields = (config['current'].get('meter.folder', ''),
+                      config['current'].get('meter', ''))
+        else:
+            fields = None
+    if len(_server_meter_cache) >= _SERVER_METER_CACHE_MAX:
+        _server_meter_cache.clear()
+    _server_meter_cache[config_content] = fields
+    return fields
+
+
+# meters.txt path -> ((mtime_ns, size), section names); re-parsed only when the file changes
+_meters_sections_cache = {}
+
+
+def _meters_sections(meters_file):
+    """Return the section (meter) names of a template's meters.txt, in file order.
+
+    Cached per path and invalidated by mtime/size, so repeated active-meter
+    changes within one template cost a stat instead of an INI parse.
+
+    :raises OSError: if meters_file cannot be stat'ed
+    """
+    st = os.stat(meters_file)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _meters_sections_cache.get(meters_file)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    meters_cfg = _scratch_config_parser()
+    meters_cfg.read(meters_file)
+    sections = tuple(meters_cfg.sections())
+    _meters_sections_cache[meters_file] = (stamp, sections)
+    return sections
+
+
 def parse_server_meter_state(config_content, templates_path, active_meter_override=None, client_theme_override=None):
     """
     Parse server config content and return (meter_folder, chosen_meter) that would be used.
     Does not write any files. Uses same rules as setup_remote_config for chosen_meter.
     If client_theme_override is (folder, meter) with both non-empty, return that and do not parse server.
     Used to compare with current theme before deciding to restart on config change.
+    templates_path is unused (meters.txt is not consulted) and kept for caller compatibility;
+    the configparser step is cached by _server_meter_fields.
     """
-    import configparser
-    from io import StringIO
-
     if client_theme_override:
         c_folder, c_meter = client_theme_override
         if (c_folder or '').strip() and (c_meter or '').strip():
@@ -107,35 +181,17 @@ def parse_server_meter_state(config_content, templates_path, active_meter_overri
     if not config_content:
         return '', 'random'
 
-    config = configparser.ConfigParser()
-    try:
-        config.read_file(StringIO(config_content))
-    except Exception:
-        return '', 'random'
-
-    if 'current' not in config:
+    fields = _server_meter_fields(config_content)
+    if fields is None:
         return '', 'random'
-
-    meter_folder = config['current'].get('meter.folder', '')
-    meter_value = config['current'].get('meter', '')
+    meter_folder, meter_value = fields
 
     chosen_meter = None
     if active_meter_override:
-        meters_file = os.path.join(templates_path, meter_folder, 'meters.txt') if meter_folder else ''
-        if meters_file and os.path.exists(meters_file):
-            try:
-                meters_cfg = configparser.ConfigParser()
-                meters_cfg.read(meters_file)
-                if active_meter_override in meters_cfg.sections():
-                    chosen_meter = active_meter_override
-                else:
-                    # Keep runtime active meter authoritative to prevent random flip-flop loops.
-                    # Validation mismatch can happen during config/template races.
-                    chosen_meter = active_meter_override
-            except Exception:
-                chosen_meter = active_meter_override
-        else:
-            chosen_meter = active_meter_override
+        # Keep runtime active meter authoritative to prevent random flip-flop loops,
+        # whether or not it validates against meters.txt (config/template races),
+        # so there is no need to read meters.txt here.
+        chosen_meter = active_meter_override
     elif not meter_value and meter_folder:
         chosen_meter = meter_folder
     elif not meter_value:
@@ -144,8 +200,6 @@ def parse_server_meter_state(config_content, templates_path, active_meter_overri
         chosen_meter = meter_value
 
     final_meter = chosen_meter or meter_folder or 'random'
-    if not final_meter:
-        final_meter = config['current'].get('meter.folder', 'random') or 'random'
 
     return meter_folder, final_meter
 
@@ -153,7 +207,8 @@ def parse_server_meter_state(config_content, templates_path, active_meter_overri
 # =============================================================================
 # Setup Remote Config
 
-def setup_remote_config(peppymeter_path, templates_path, config_fetcher, active_meter_override=None, client_config=None):
+def setup_remote_config(peppymeter_path, templates_path, config_fetcher, active_meter_override=None, client_config=None,
+                        known_version=None):
     """
     Set up config.txt for remote client mode.
     
@@ -165,32 +220,35 @@ def setup_remote_config(peppymeter_path, templates_path, config_fetcher, active_
     :param config_fetcher: ConfigFetcher instance for HTTP config retrieval
     :param active_meter_override: If set, override meter name (for random meter sync)
     :param client_config: Client config dict; if display.meter_folder and display.meter are set, use as fixed theme
+    :param known_version: Latest announced config_version; when it matches the fetcher's cache the HTTP fetch is skipped
     """
     import configparser
     
     config_path = os.path.join(peppymeter_path, "config.txt")
     server_config_fetched = False
+    config_content = None
     
     # Try to fetch config from server via HTTP
     if config_fetcher:
         print("Fetching config from server via HTTP...")
-        success, config_content, version = config_fetcher.fetch()
+        success, config_content, version = config_fetcher.fetch_if_changed(known_version)
         if success and config_content:
-            try:
-                with open(config_path, 'w') as f:
-                    f.write(config_content)
-                server_config_fetched = True
-                print(f"  Config fetched successfully (version: {version})")
-            except Exception as e:
-                print(f"  Failed to write fetched config: {e}")
+            server_config_fetched = True
+            print(f"  Config fetched successfully (version: {version})")
     
     if not server_config_fetched:
         print("Server config not available, using defaults")
     
-    # Now read and adjust the config for local use
+    # Now read and adjust the config for local use; fetched content is parsed
+    # in memory, config.txt is written once below with the local adjustments
     config = configparser.ConfigParser()
     
-    if os.path.exists(config_path):
+    if server_config_fetched:
+        try:
+            config.read_string(config_content)
+        except Exception:
+            pass  # Start fresh if parse error
+    elif os.path.exists(config_path):
         try:
             config.read(config_path)
         except Exception:
@@ -225,7 +283,8 @@ def setup_remote_config(peppymeter_path, templates_path, config_fetcher, active_
     # If active_meter_override is provided (from server's random meter sync),
     # only update 'meter' - this is the section name currently displayed
     # Keep meter.folder unchanged (it's already correct from server config)
-    log_client(f"Config from server: meter.folder={meter_folder!r}, meter={meter_value!r}, override={active_meter_override!r}", "trace", "config")
+    if log_enabled("trace", "config"):
+        log_client(f"Config from server: meter.folder={meter_folder!r}, meter={meter_value!r}, override={active_meter_override!r}", "trace", "config")
     
     # Client theme override (kiosk / fixed theme): use display.meter_folder + display.meter if both set
     display = (client_config or {}).get("display") or {}
@@ -244,17 +303,14 @@ def setup_remote_config(peppymeter_path, templates_path, config_fetcher, active_
             meters_file = os.path.join(templates_path, meter_folder, 'meters.txt') if meter_folder else ''
             if meters_file and os.path.exists(meters_file):
                 try:
-                    import configparser as cp
-                    meters_cfg = cp.ConfigParser()
-                    meters_cfg.read(meters_file)
+                    sections = _meters_sections(meters_file)
                     # Check if the active_meter_override is a valid section in meters.txt
-                    if active_meter_override in meters_cfg.sections():
+                    if active_meter_override in sections:
                         chosen_meter = active_meter_override
                         print(f"  Using active meter from server: {active_meter_override}")
                     else:
                         # Deterministic fallback (never "random" for runtime override):
                         # keep existing concrete meter if valid, otherwise first section.
-                        sections = meters_cfg.sections()
                         log_client(f"Active meter '{active_meter_override}' not found in {meter_folder}, using deterministic fallback", "verbose")
                         if meter_value and meter_value in sections and meter_value.lower() != "random" and "," not in meter_value:
                             chosen_meter = meter_value
@@ -325,10 +381,31 @@ def setup_remote_config(peppymeter_path, templates_path, config_fetcher, active_
 
     final_meter_folder = config['current'].get('meter.folder', '')
 
-    with open(config_path, 'w') as f:
-        config.write(f)
-        f.flush()
-        os.fsync(f.fileno())  # Force write to disk
+    # Write a sibling temp file and rename it over config.txt, so a crash
+    # mid-write can never leave PeppyMeter a truncated config
+    tmp_path = f"{config_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            config.write(f)
+            f.flush()
+            os.fsync(f.fileno())  # Force write to disk
+        os.replace(tmp_path, config_path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    if hasattr(os, 'O_DIRECTORY'):
+        # Persist the rename itself (POSIX; not possible on Windows)
+        try:
+            dir_fd = os.open(peppymeter_path, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
 
     if server_config_fetched:
         print(f"  Config adjusted for local use (meter: {final_meter_folder})")
@@ -389,17 +466,102 @@ def _pygame_display_flags(pg, is_windowed, is_fullscreen, double_buffer=False):
     return flags
 
 
+def _build_sync_modal(pg, screen_w, screen_h):
+    """Compose the full-screen "Waiting for data from server" frame.
+
+    The modal is static, so it is drawn once (rounded box, border, text) into a
+    surface in the display's pixel format; showing it is then a single blit.
+
+    :returns: pygame Surface of (screen_w, screen_h)
+    """
+    font_sync = _resolve_pygame_ui_font(pg, min(28, max(18, screen_h // 25)))
+    line1 = font_sync.render("Waiting for data from server", True, (240, 240, 240))
+    line2 = font_sync.render("Please wait a moment.", True, (200, 200, 200))
+    modal_w = min(500, int(screen_w * 0.6))
+    modal_h = 140
+    modal_x = (screen_w - modal_w) // 2
+    modal_y = (screen_h - modal_h) // 2
+    frame = pg.Surface((screen_w, screen_h)).convert()
+    frame.fill((30, 30, 35))
+    pg.draw.rect(frame, (55, 55, 60), (modal_x, modal_y, modal_w, modal_h), border_radius=12)
+    pg.draw.rect(frame, (80, 80, 88), (modal_x, modal_y, modal_w, modal_h), 2, border_radius=12)
+    frame.blit(line1, line1.get_rect(center=(screen_w // 2, modal_y + modal_h // 2 - 22)))
+    frame.blit(line2, line2.get_rect(center=(screen_w // 2, modal_y + modal_h // 2 + 18)))
+    return frame
+
+
+# Framebuffer/console SDL settings that would stop a desktop window from opening
+_SDL_FRAMEBUFFER_VARS = ('SDL_VIDEODRIVER', 'SDL_FBDEV', 'SDL_MOUSEDEV', 'SDL_MOUSEDRV', 'SDL_NOMOUSE')
+
+
 def _prepare_sdl_environment(android=None):
-    """Clear framebuffer SDL vars; set DISPLAY only on desktop."""
+    """Clear framebuffer SDL vars; set DISPLAY only on desktop.
+
+    Call once per display entry point, before pygame's display is initialized.
+    The engine's own SDL setup (init_display) is never used by the client and
+    config.txt blanks its sdl.env values, so nothing re-exports these later.
+    """
     if android is None:
         android = is_android()
-    for var in ('SDL_VIDEODRIVER', 'SDL_FBDEV', 'SDL_MOUSEDEV', 'SDL_MOUSEDRV', 'SDL_NOMOUSE'):
+    for var in _SDL_FRAMEBUFFER_VARS:
         os.environ.pop(var, None)
     if not android and 'DISPLAY' not in os.environ:
         os.environ['DISPLAY'] = ':0'
+    # Render batching defers draw calls across the software renderer, which is
+    # not safe with the spectrum/meter threads drawing; honour a user override
+    os.environ.setdefault('SDL_RENDER_BATCHING', '0')
     return android
 
 
+# Whether the engine's start_display_output() takes check_reload_callback;
+# decided once per process by _detect_reload_support()
+_reload_support = [None]
+
+
+def _detect_reload_support(start_display_output):
+    """Return True if start_display_output accepts check_reload_callback.
+
+    Older volumio_peppymeter versions lack the argument. Reads the parameter
+    names straight from the code object (no Signature construction) and
+    remembers the answer for later calls.
+
+    :param start_display_output: The engine's start_display_output function
+    """
+    if _reload_support[0] is None:
+        try:
+            code = start_display_output.__code__
+            n_args = code.co_argcount + code.co_kwonlyargcount
+            _reload_support[0] = 'check_reload_callback' in code.co_varnames[:n_args]
+        except AttributeError:
+            # Not a plain Python function (wrapped/builtin): ask inspect instead
+            try:
+                import inspect
+                _reload_support[0] = 'check_reload_callback' in inspect.signature(start_display_output).parameters
+            except Exception:
+                _reload_support[0] = False
+    return _reload_support[0]
+
+
+_x11_threads_done = [False]
+
+
+def _x11_init_threads():
+    """Call Xlib's XInitThreads() once per process (desktop X11 only).
+
+    The engine's worker threads still touch pygame while the main loop
+    renders, so keep Xlib in thread-safe mode. Later display runs in the
+    same process skip the dlopen; the flag is set even on failure (no X11).
+    """
+    if _x11_threads_done[0]:
+        return
+    _x11_threads_done[0] = True
+    try:
+        import ctypes
+        ctypes.CDLL('libX11.so.6').XInitThreads()
+    except Exception:
+        pass  # Not on X11 or library not found
+
+
 def _wire_peppymeter(pm, meter_config_volumio, remote_ds, spectrum_factory=None):
     """Wire remote data source and create callback handler.
 
@@ -411,16 +573,17 @@ def _wire_peppymeter(pm, meter_config_volumio, remote_ds, spectrum_factory=None)
     """
     from volumio_peppymeter import CallBack
 
+    # Peppymeter always builds its meter in __init__; read it once
+    meter = pm.meter
     pm.data_source = remote_ds
-    if hasattr(pm, 'meter') and pm.meter:
-        pm.meter.data_source = remote_ds
+    meter.data_source = remote_ds
 
-    callback = CallBack(pm.util, meter_config_volumio, pm.meter)
+    callback = CallBack(pm.util, meter_config_volumio, meter)
     callback.spectrum_factory = spectrum_factory
-    pm.meter.callback_start = callback.peppy_meter_start
-    pm.meter.callback_stop = callback.peppy_meter_stop
+    meter.callback_start = callback.peppy_meter_start
+    meter.callback_stop = callback.peppy_meter_stop
     pm.dependent = callback.peppy_meter_update
-    pm.meter.malloc_trim = callback.trim_memory
+    meter.malloc_trim = callback.trim_memory
     pm.malloc_trim = callback.exit_trim_memory
 
     return callback
@@ -436,15 +599,17 @@ def _attach_display(pm, meter_config_volumio, screen, screen_w, screen_h, depth,
     from configfileparser import SCREEN_INFO, WIDTH, HEIGHT, DEPTH, SDL_ENV, DOUBLE_BUFFER, SCREEN_RECT
     from volumio_configfileparser import COLOR_DEPTH
 
-    new_screen_w = pm.util.meter_config[SCREEN_INFO][WIDTH]
-    new_screen_h = pm.util.meter_config[SCREEN_INFO][HEIGHT]
+    meter_config = pm.util.meter_config
+    screen_info = meter_config[SCREEN_INFO]
+    new_screen_w = screen_info[WIDTH]
+    new_screen_h = screen_info[HEIGHT]
     new_depth = meter_config_volumio[COLOR_DEPTH]
 
     if (new_screen_w, new_screen_h) != (screen_w, screen_h):
         print(f"Display resizing: {screen_w}x{screen_h} -> {new_screen_w}x{new_screen_h}")
         new_flags = _pygame_display_flags(
             pg, is_windowed, is_fullscreen,
-            double_buffer=bool(pm.util.meter_config[SDL_ENV][DOUBLE_BUFFER]),
+            double_buffer=bool(meter_config[SDL_ENV][DOUBLE_BUFFER]),
         )
         screen = pg.display.set_mode((new_screen_w, new_screen_h), new_flags, new_depth)
         screen_w = new_screen_w
@@ -457,12 +622,12 @@ def _attach_display(pm, meter_config_volumio, screen, screen_w, screen_h, depth,
         depth = new_depth
 
     # Attach screen to PeppyMeter
-    pm.util.meter_config[SCREEN_INFO][WIDTH] = screen_w
-    pm.util.meter_config[SCREEN_INFO][HEIGHT] = screen_h
-    pm.util.meter_config[SCREEN_INFO][DEPTH] = depth
+    screen_info[WIDTH] = screen_w
+    screen_info[HEIGHT] = screen_h
+    screen_info[DEPTH] = depth
     pm.util.PYGAME_SCREEN = screen
     pm.util.screen_copy = screen
-    pm.util.meter_config[SCREEN_RECT] = pg.Rect(0, 0, screen_w, screen_h)
+    meter_config[SCREEN_RECT] = pg.Rect(0, 0, screen_w, screen_h)
 
     return screen, screen_w, screen_h, depth
 
@@ -565,7 +730,6 @@ def run_peppymeter_display(level_receiver, server_info, templates_path, config_f
     client_config = client_config or {}
     android = is_android()
     
-    import ctypes
     import pygame as pg
 
     # Android / Pydroid: initialize pygame display first (Lee.Yan community bring-up).
@@ -629,6 +793,9 @@ def run_peppymeter_display(level_receiver, server_info, templates_path, config_f
     config_path, initial_chosen_meter, initial_meter_folder = setup_remote_config(
         peppymeter_path, templates_path, config_fetcher, client_config=client_config
     )
+    # Warm the skin images while the engine imports and the sync modal run
+    if templates_path and initial_meter_folder:
+        prewarm_meter_assets(os.path.join(templates_path, initial_meter_folder))
     
     if android:
         print("  SDL environment configured for Android (no X11 DISPLAY)")
@@ -659,10 +826,7 @@ def run_peppymeter_display(level_receiver, server_info, templates_path, config_f
     try:
         # Enable X11 threading (desktop only)
         if not android:
-            try:
-                ctypes.CDLL('libX11.so.6').XInitThreads()
-            except Exception:
-                pass  # Not on X11 or library not found
+            _x11_init_threads()
         
         print("Loading PeppyMeter...")
         
@@ -686,10 +850,16 @@ def run_peppymeter_display(level_receiver, server_info, templates_path, config_f
         #   CurDir + '/screensaver/spectrum'   = ~/peppy_remote/screensaver/spectrum (correct)
         # Without this patch, SpectrumOutput gets a doubled path and crashes.
         import volumio_peppymeter
-        import volumio_spectrum
         volumio_peppymeter.CurDir = SCRIPT_DIR
         volumio_peppymeter.PeppyPath = os.path.join(SCRIPT_DIR, 'screensaver', 'peppymeter')
-        volumio_spectrum.CurDir = SCRIPT_DIR
+        # Only import volumio_spectrum for spectrum clients; otherwise patch it
+        # just if the engine already loaded it (saves its cold import)
+        if spectrum_receiver:
+            import volumio_spectrum
+        else:
+            volumio_spectrum = sys.modules.get('volumio_spectrum')
+        if volumio_spectrum is not None:
+            volumio_spectrum.CurDir = SCRIPT_DIR
         
         # Initialize PeppyMeter, parse Volumio config, init debug
         print("Initializing PeppyMeter...")
@@ -758,10 +928,11 @@ def run_peppymeter_display(level_receiver, server_info, templates_path, config_f
             log_client(f"Persist countdown enabled: {config_fetcher.persist_duration}s, mode={config_fetcher.persist_display}", "verbose")
         
         # Get screen dimensions
-        screen_w = pm.util.meter_config[SCREEN_INFO][WIDTH]
-        screen_h = pm.util.meter_config[SCREEN_INFO][HEIGHT]
+        screen_info = pm.util.meter_config[SCREEN_INFO]
+        screen_w = screen_info[WIDTH]
+        screen_h = screen_info[HEIGHT]
         depth = meter_config_volumio[COLOR_DEPTH]
-        pm.util.meter_config[SCREEN_INFO][DEPTH] = depth
+        screen_info[DEPTH] = depth
         print(f"Display: {screen_w}x{screen_h}")
         
         # memory_limit() can be problematic under Pydroid; skip on Android
@@ -769,15 +940,15 @@ def run_peppymeter_display(level_receiver, server_info, templates_path, config_f
             memory_limit()
         
         # Initialize display - CLIENT SPECIFIC (not using init_display from volumio_peppymeter)
-        # pygame may already be initialized early on Android (Lee.Yan)
-        _prepare_sdl_environment(android=android)
+        # pygame may already be initialized early on Android (Lee.Yan);
+        # the SDL environment was prepared once at the top of this function
         if not android:
             pg.display.init()
         pg.mouse.set_visible(False)
         pg.font.init()
         
-        peppy_running_file = os.path.join(tempfile.gettempdir(), 'peppyrunning')
         from pathlib import Path
+        peppy_running_path = Path(tempfile.gettempdir()) / 'peppyrunning'
         
         # Determine display flags from config (passed via environment)
         is_windowed = os.environ.get('PEPPY_DISPLAY_WINDOWED', '1') == '1'
@@ -803,49 +974,68 @@ def run_peppymeter_display(level_receiver, server_info, templates_path, config_f
         
         # Show "Waiting for server" modal until first UDP announcement (or timeout)
         SYNC_TIMEOUT = 10.0  # seconds
-        sync_start = time.time()
-        font_sync = _resolve_pygame_ui_font(pg, min(28, max(18, screen_h // 25)))
-        line1 = font_sync.render("Waiting for data from server", True, (240, 240, 240))
-        line2 = font_sync.render("Please wait a moment.", True, (200, 200, 200))
-        modal_w = min(500, int(screen_w * 0.6))
-        modal_h = 140
-        modal_x = (screen_w - modal_w) // 2
-        modal_y = (screen_h - modal_h) // 2
-        while not version_listener.first_announcement_received and (time.time() - sync_start) < SYNC_TIMEOUT:
-            for ev in pg.event.get():
+        sync_start = time.monotonic()
+        modal_frame = _build_sync_modal(pg, screen_w, screen_h)
+        screen.blit(modal_frame, (0, 0))
+        pg.display.flip()
+        while not version_listener.first_announcement_received and (time.monotonic() - sync_start) < SYNC_TIMEOUT:
+            # Sleep in SDL until an event arrives; the timeout bounds how late we
+            # notice the announcement. Anything queued behind it is drained too.
+            ev = pg.event.wait(100)
+            if ev.type == pg.NOEVENT:
+                continue
+            for ev in [ev] + pg.event.get():
                 if ev.type == pg.QUIT:
                     version_listener.stop_listener()
                     raise SystemExit(0)
                 if ev.type == pg.KEYDOWN and ev.key in (pg.K_ESCAPE, pg.K_q):
                     version_listener.stop_listener()
                     raise SystemExit(0)
-            screen.fill((30, 30, 35))
-            pg.draw.rect(screen, (55, 55, 60), (modal_x, modal_y, modal_w, modal_h), border_radius=12)
-            pg.draw.rect(screen, (80, 80, 88), (modal_x, modal_y, modal_w, modal_h), 2, border_radius=12)
-            l1_rect = line1.get_rect(center=(screen_w // 2, modal_y + modal_h // 2 - 22))
-            l2_rect = line2.get_rect(center=(screen_w // 2, modal_y + modal_h // 2 + 18))
-            screen.blit(line1, l1_rect)
-            screen.blit(line2, l2_rect)
+            # Static content: repaint only after window events (expose, resize)
+            screen.blit(modal_frame, (0, 0))
             pg.display.flip()
-            time.sleep(0.05)
-        if version_listener.first_announcement_received and version_listener.new_active_meter:
-            active_meter_override = version_listener.new_active_meter
-            os.chdir(peppymeter_path)
-            config_path, new_chosen_meter, new_meter_folder = setup_remote_config(
-                peppymeter_path, templates_path, config_fetcher, active_meter_override, client_config=client_config
+        del modal_frame
+        
+        def _rebuild_peppymeter(active_meter_override, label, display):
+            """Rewrite config.txt for the server's current state and build a fresh,
+            wired PeppyMeter on the (possibly resized) display.
+
+            Shared by the post-sync override and the reload loop.
+
+            :param active_meter_override: Meter name to force (server active_meter), or ''
+            :param label: Tag for log lines ('sync' or 'reload')
+            :param display: Current (screen, screen_w, screen_h, depth)
+            :returns: (pm, meter_config_volumio, callback, (screen, screen_w, screen_h, depth))
+            """
+            # RemoteSpectrumOutput restores CWD itself; only the engine's own code
+            # could still leave us elsewhere, so chdir back just in that case
+            cwd = os.getcwd()
+            if cwd != peppymeter_path:
+                log_client(f"CWD was {cwd!r} before {label}, restoring {peppymeter_path!r}", "trace", "config")
+                os.chdir(peppymeter_path)
+            _, new_chosen_meter, new_meter_folder = setup_remote_config(
+                peppymeter_path, templates_path, config_fetcher, active_meter_override, client_config=client_config,
+                known_version=version_listener.announced_version
             )
             current_version_holder['active_meter'] = _norm_str(new_chosen_meter)
             current_version_holder['active_meter_folder'] = _norm_str(new_meter_folder)
             current_version_holder['version'] = _norm_str(config_fetcher.cached_version)
-            pm, meter_config_volumio = _create_peppymeter(label="sync")
-            pm_holder[0] = pm
-            meter_config_holder[0] = meter_config_volumio
-            callback = _wire_peppymeter(pm, meter_config_volumio, remote_ds, spectrum_factory)
-            callback.persist_manager = persist_manager
-            screen, screen_w, screen_h, depth = _attach_display(
-                pm, meter_config_volumio, screen, screen_w, screen_h, depth,
-                is_windowed, is_fullscreen
-            )
+            # Always a fresh Peppymeter, even when only the meter changed within the
+            # same folder: the engine resolves [current] meter and its skin at
+            # construction and has no in-place switch once start_display_output()
+            # has returned. Same-folder skins are re-read from the OS cache.
+            new_pm, new_config = _create_peppymeter(label=label)
+            pm_holder[0] = new_pm
+            meter_config_holder[0] = new_config
+            new_callback = _wire_peppymeter(new_pm, new_config, remote_ds, spectrum_factory)
+            new_callback.persist_manager = persist_manager
+            # Resize display if resolution changed, attach screen to pm
+            new_display = _attach_display(new_pm, new_config, *display, is_windowed, is_fullscreen)
+            return new_pm, new_config, new_callback, new_display
+
+        if version_listener.first_announcement_received and version_listener.new_active_meter:
+            pm, meter_config_volumio, callback, (screen, screen_w, screen_h, depth) = _rebuild_peppymeter(
+                version_listener.new_active_meter, "sync", (screen, screen_w, screen_h, depth))
             version_listener.reload_requested = False
             version_listener.new_active_meter = None
         
@@ -862,24 +1052,20 @@ def run_peppymeter_display(level_receiver, server_info, templates_path, config_f
         print(f"Starting meter display ({mode_str})...")
         print("Press ESC or Q to exit, or click/touch screen")
         
-        Path(peppy_running_file).touch()
+        peppy_running_path.touch()
         try:
-            Path(peppy_running_file).chmod(0o777)
+            peppy_running_path.chmod(0o777)
         except (OSError, AttributeError):
             pass
         # Support both old and new volumio_peppymeter (new has check_reload_callback)
-        try:
-            import inspect
-            _sig = inspect.signature(start_display_output)
-            reload_callback_supported = 'check_reload_callback' in _sig.parameters
-        except Exception:
-            reload_callback_supported = False
+        reload_callback_supported = _detect_reload_support(start_display_output)
 
         # Cache for "should exit for reload?" so we only fetch once per reload signal
-        _reload_check_done = [False]
-        _reload_should_exit = [None]
-        _reload_generation_seen = [-1]
-        _pending_active_meter = [None]
+        # (closure cells via nonlocal: the engine calls the callback every frame)
+        reload_check_done = False
+        reload_should_exit = None
+        reload_generation_seen = -1
+        pending_active_meter = None
         # Client theme override for reload checks (kiosk: use display.meter_folder + display.meter when both set)
         _display = client_config.get("display") or {}
         _of = (str(_display.get("meter_folder") or "")).strip()
@@ -891,28 +1077,54 @@ def run_peppymeter_display(level_receiver, server_info, templates_path, config_f
         if _is_kiosk_random_mode(client_override):
             version_listener.ignore_active_meter = True
 
+        # (generation, success, config_content) from _fetch_for_reload workers
+        reload_fetches = queue.SimpleQueue()
+
+        def _fetch_for_reload(gen):
+            """Worker: fetch config for reload generation gen off the render thread."""
+            # Active-meter-only announcements keep config_version: reuse the cached
+            # config instead of an HTTP round-trip (meter state is still compared)
+            success, config_content, _ = config_fetcher.fetch_if_changed(version_listener.announced_version)
+            reload_fetches.put((gen, success, config_content))
+
         def _check_reload_callback():
-            """Return True only when we actually need to reload (folder or theme would change)."""
-            if not version_listener.reload_requested:
+            """Return True only when we actually need to reload (folder or theme would change).
+
+            Called from the engine's render loop, so it never blocks: the config
+            fetch runs in a worker and this returns False until its result is in.
+            """
+            nonlocal reload_check_done, reload_should_exit, reload_generation_seen
+            # Debounced: a burst of announcements becomes one check/rebuild
+            if not version_listener.is_reload_ready():
                 return False
             gen = version_listener.reload_generation
-            if gen != _reload_generation_seen[0]:
-                _reload_generation_seen[0] = gen
-                _reload_check_done[0] = False
-            elif _reload_check_done[0]:
-                return _reload_should_exit[0]
+            if gen != reload_generation_seen:
+                reload_generation_seen = gen
+                reload_check_done = False
+                threading.Thread(target=_fetch_for_reload, args=(gen,), daemon=True,
+                                 name="PeppyReloadFetch").start()
+                return False
+            elif reload_check_done:
+                return reload_should_exit
+            # Take this generation's result; results of superseded generations are dropped
+            while True:
+                try:
+                    fetched_gen, success, config_content = reload_fetches.get_nowait()
+                except queue.Empty:
+                    return False
+                if fetched_gen == gen:
+                    break
             # Authoritative on-screen state is pm.util; do not prefer current_version_holder (it can
             # race ahead of the display after UDP and falsely match parse_server_meter_state).
             active_meter_override = (
                 version_listener.new_active_meter
-                or _pending_active_meter[0]
+                or pending_active_meter
                 or current_version_holder.get('active_meter', ''))
             current_folder = pm.util.meter_config.get(SCREEN_INFO, {}).get(METER_FOLDER, '')
             current_meter = (pm.util.meter_config.get(METER, '') or '') or current_version_holder.get('active_meter', '')
-            success, config_content, _ = config_fetcher.fetch()
             if not success or not config_content:
-                _reload_check_done[0] = True
-                _reload_should_exit[0] = True
+                reload_check_done = True
+                reload_should_exit = True
                 return True
             new_meter_folder, new_chosen_meter = parse_server_meter_state(
                 config_content, templates_path, active_meter_override, client_theme_override=client_override
@@ -925,12 +1137,12 @@ def run_peppymeter_display(level_receiver, server_info, templates_path, config_f
                 current_version_holder['version'] = _norm_str(config_fetcher.cached_version)
                 current_version_holder['active_meter'] = _norm_str(new_chosen_meter) or _norm_str(current_meter)
                 current_version_holder['active_meter_folder'] = _norm_str(new_meter_folder) or _norm_str(current_folder)
-                _reload_check_done[0] = True
-                _reload_should_exit[0] = False
+                reload_check_done = True
+                reload_should_exit = False
                 print("Config/folder+theme unchanged, continuing.")
                 return False
-            _reload_check_done[0] = True
-            _reload_should_exit[0] = True
+            reload_check_done = True
+            reload_should_exit = True
             return True
 
         try:
@@ -942,11 +1154,10 @@ def run_peppymeter_display(level_receiver, server_info, templates_path, config_f
                 # appropriate after comparing on-screen state to the server.
                 # Save new_active_meter BEFORE clearing for use after display loop exits
                 pending_active_meter = version_listener.new_active_meter
-                _pending_active_meter[0] = pending_active_meter
                 version_listener.new_active_meter = None
-                Path(peppy_running_file).touch()
+                peppy_running_path.touch()
                 try:
-                    Path(peppy_running_file).chmod(0o777)
+                    peppy_running_path.chmod(0o777)
                 except (OSError, AttributeError):
                     pass
                 if reload_callback_supported:
@@ -968,7 +1179,7 @@ def run_peppymeter_display(level_receiver, server_info, templates_path, config_f
                 current_folder = pm.util.meter_config.get(SCREEN_INFO, {}).get(METER_FOLDER, '')
                 current_meter = (pm.util.meter_config.get(METER, '') or '') or current_version_holder.get('active_meter', '')
                 prev_ver = _norm_str(current_version_holder.get('version'))
-                success, config_content, _ = config_fetcher.fetch()
+                success, config_content, _ = config_fetcher.fetch_if_changed(version_listener.announced_version)
                 new_ver = _norm_str(config_fetcher.cached_version or '')
                 if success and config_content:
                     new_meter_folder, new_chosen_meter = parse_server_meter_state(
@@ -1004,26 +1215,6 @@ def run_peppymeter_display(level_receiver, server_info, templates_path, config_f
                     else:
                         print("Reloading: re-syncing with server (display/state mismatch).")
                 
-                # Restore CWD before reload - spectrum may have changed it to its template directory
-                os.chdir(peppymeter_path)
-                config_path, new_chosen_meter, new_meter_folder = setup_remote_config(
-                    peppymeter_path, templates_path, config_fetcher, active_meter_override, client_config=client_config
-                )
-                current_version_holder['active_meter'] = _norm_str(new_chosen_meter)
-                current_version_holder['active_meter_folder'] = _norm_str(new_meter_folder)
-                current_version_holder['version'] = _norm_str(config_fetcher.cached_version)
-                pm, meter_config_volumio = _create_peppymeter(label="reload")
-                pm_holder[0] = pm
-                meter_config_holder[0] = meter_config_volumio
-                callback = _wire_peppymeter(pm, meter_config_volumio, remote_ds, spectrum_factory)
-                
-                # Update persist manager with potentially changed settings from server
-                persist_manager.update_settings(
-                    config_fetcher.persist_duration,
-                    config_fetcher.persist_display
-                )
-                callback.persist_manager = persist_manager
-                
                 # Stop old spectrum if running
                 old_spectrum = remote_spectrum_holder[0] or remote_spectrum
                 if spectrum_receiver and old_spectrum:
@@ -1034,10 +1225,13 @@ def run_peppymeter_display(level_receiver, server_info, templates_path, config_f
                     remote_spectrum = None
                     remote_spectrum_holder[0] = None
                 
-                # Resize display if resolution changed, attach screen to pm
-                screen, screen_w, screen_h, depth = _attach_display(
-                    pm, meter_config_volumio, screen, screen_w, screen_h, depth,
-                    is_windowed, is_fullscreen
+                pm, meter_config_volumio, callback, (screen, screen_w, screen_h, depth) = _rebuild_peppymeter(
+                    active_meter_override, "reload", (screen, screen_w, screen_h, depth))
+                
+                # Update persist manager with potentially changed settings from server
+                persist_manager.update_settings(
+                    config_fetcher.persist_duration,
+                    config_fetcher.persist_display
                 )
                 
                 # Re-initialize remote spectrum AFTER screen is attached
@@ -1060,8 +1254,7 @@ def run_peppymeter_display(level_receiver, server_info, templates_path, config_f
             # Cleanup persist manager
             if persist_manager:
                 persist_manager.cleanup()
-            if os.path.exists(peppy_running_file):
-                os.remove(peppy_running_file)
+            peppy_running_path.unlink(missing_ok=True)
         
         return True
         
@@ -1082,8 +1275,22 @@ def run_peppymeter_display(level_receiver, server_info, templates_path, config_f
 # =============================================================================
 # Simple Test Display (pygame)
 
-def run_test_display(level_receiver):
-    """Simple pygame display for testing - shows VU bars."""
+_TEST_BAR_GREEN = (0, 200, 0)
+_TEST_BAR_BLUE = (0, 150, 200)
+_TEST_FRAME_GREY = (100, 100, 100)
+_TEST_LABEL_GREY = (200, 200, 200)
+
+
+def run_test_display(level_receiver, fps=20):
+    """Simple pygame display for testing - shows VU bars.
+
+    :param level_receiver: LevelReceiver to display
+    :param fps: Redraw rate cap; frames are only drawn when levels change
+    """
+    try:
+        fps = max(1, int(fps))
+    except (TypeError, ValueError):
+        fps = 20
     
     android = _prepare_sdl_environment()
     
@@ -1106,68 +1313,131 @@ def run_test_display(level_receiver):
     clock = pygame.time.Clock()
     font = pygame.font.Font(None, 36)
     font_small = pygame.font.Font(None, 24)
+    # Static text never changes: render it once, blit it each frame
+    title_text = font.render("PeppyMeter Remote - Test Display", True, (255, 255, 255))
+    info_text = font_small.render("Press ESC or Q to exit", True, (150, 150, 150))
+    
+    # Level readouts are quantized to 0.1, so steady or silent audio repeats
+    # the same strings; reuse their rendered surfaces
+    from functools import lru_cache
+    
+    @lru_cache(maxsize=2048)
+    def _render_label(text, rgb):
+        return font_small.render(text, True, rgb)
+    
+    bar_width = 60
+    bar_max_height = 300
+    bar_y = 100
+    label_y = bar_y + bar_max_height + 10
+    # (x, fill colour, label prefix) for the left, right and mono bars
+    bars = ((200, _TEST_BAR_GREEN, "L"), (300, _TEST_BAR_GREEN, "R"), (540, _TEST_BAR_BLUE, "M"))
+    bar_rects = [pygame.Rect(x, bar_y, bar_width, bar_max_height) for x, _, _ in bars]
+    # Level fills: a solid surface per colour, of which the bottom `height`
+    # rows are blitted each frame (a plain copy, no rect fill). The dest and
+    # source-area Rects are moved/resized in place.
+    fill_surfs = {}
+    for _, color, _ in bars:
+        if color not in fill_surfs:
+            fill_surfs[color] = pygame.Surface((bar_width, bar_max_height)).convert()
+            fill_surfs[color].fill(color)
+    fill_rects = [pygame.Rect(x, bar_y + bar_max_height, bar_width, 0) for x, _, _ in bars]
+    fill_areas = [pygame.Rect(0, bar_max_height, bar_width, 0) for _ in bars]
+    bar_bottom = bar_y + bar_max_height
+    # Bar height per 0.1 level step (0.0..100.0), clamped; no per-frame scaling
+    bar_heights = [i * bar_max_height // 1000 for i in range(1001)]
+    
+    # Everything static lives on one background; each frame only the bars and
+    # the changing labels are repainted from it and pushed with display.update
+    background = pygame.Surface(screen.get_size()).convert()
+    background.fill((20, 20, 30))
+    for bar_rect in bar_rects:
+        pygame.draw.rect(background, _TEST_FRAME_GREY, bar_rect, 2)
+    background.blit(title_text, (50, 20))
+    background.blit(info_text, (50, 60))
     
+    # Bound once: everything below runs per frame
+    blit = screen.blit
+    draw_rect = pygame.draw.rect
+    event_get = pygame.event.get
+    wait_data = level_receiver.new_data.wait
+    clear_data = level_receiver.new_data.clear
+    snapshot = level_receiver.snapshot
+    render_small = font_small.render
+    QUIT, KEYDOWN = pygame.QUIT, pygame.KEYDOWN
+    quit_keys = (pygame.K_ESCAPE, pygame.K_q)
+    
+    text_rects = {}  # label key -> rect it was last drawn at
+    
+    def _draw_text(key, surf, pos):
+        """Replace the previous text for key with surf; return the rect to update."""
+        rect = surf.get_rect(topleft=pos)
+        area = rect.union(text_rects.get(key, rect))
+        blit(background, area, area)
+        blit(surf, rect)
+        text_rects[key] = rect
+        return area
+    
+    expose_events = {pygame.VIDEOEXPOSE, getattr(pygame, 'WINDOWEXPOSED', pygame.VIDEOEXPOSE)}
+    full_redraw = True
+    last_shown = None
     running = True
     while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+        # Sleep until the receiver has a new packet; the timeout only keeps
+        # the window responsive to keys/close while no audio data arrives
+        got_data = wait_data(0.1)
+        clear_data()
+        events = event_get()
+        for event in events:
+            if event.type == QUIT:
                 running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key in (pygame.K_ESCAPE, pygame.K_q):
+            elif event.type == KEYDOWN:
+                if event.key in quit_keys:
                     running = False
+            elif event.type in expose_events:
+                full_redraw = True
+        if not running:
+            break
+        if not (got_data or events or full_redraw):
+            continue
         
-        # Clear screen
-        screen.fill((20, 20, 30))
-        
-        # Get levels
-        left, right, mono = level_receiver.get_levels()
-        
-        # Draw VU bars
-        bar_width = 60
-        bar_max_height = 300
-        bar_y = 100
+        # Get levels; skip the frame when nothing visible changed. Keyed on
+        # round(level, 1), which the .1f readouts and the bar index both use,
+        # so steady or silent input repeats exactly
+        *levels, seq = snapshot()
+        shown = tuple(round(level, 1) for level in levels)
+        if shown == last_shown and not (events or full_redraw):
+            continue
+        last_shown = shown
         
-        # Left channel
-        left_height = int((left / 100.0) * bar_max_height)
-        pygame.draw.rect(screen, (0, 200, 0), 
-                        (200, bar_y + bar_max_height - left_height, bar_width, left_height))
-        pygame.draw.rect(screen, (100, 100, 100), 
-                        (200, bar_y, bar_width, bar_max_height), 2)
-        left_text = font_small.render(f"L: {left:.1f}", True, (200, 200, 200))
-        screen.blit(left_text, (200, bar_y + bar_max_height + 10))
+        if full_redraw:
+            blit(background, (0, 0))
+            text_rects.clear()
         
-        # Right channel
-        right_height = int((right / 100.0) * bar_max_height)
-        pygame.draw.rect(screen, (0, 200, 0), 
-                        (300, bar_y + bar_max_height - right_height, bar_width, right_height))
-        pygame.draw.rect(screen, (100, 100, 100), 
-                        (300, bar_y, bar_width, bar_max_height), 2)
-        right_text = font_small.render(f"R: {right:.1f}", True, (200, 200, 200))
-        screen.blit(right_text, (300, bar_y + bar_max_height + 10))
-        
-        # Mono channel
-        mono_height = int((mono / 100.0) * bar_max_height)
-        pygame.draw.rect(screen, (0, 150, 200), 
-                        (540, bar_y + bar_max_height - mono_height, bar_width, mono_height))
-        pygame.draw.rect(screen, (100, 100, 100), 
-                        (540, bar_y, bar_width, bar_max_height), 2)
-        mono_text = font_small.render(f"M: {mono:.1f}", True, (200, 200, 200))
-        screen.blit(mono_text, (540, bar_y + bar_max_height + 10))
-        
-        # Title
-        title_text = font.render("PeppyMeter Remote - Test Display", True, (255, 255, 255))
-        screen.blit(title_text, (50, 20))
-        
-        # Instructions
-        info_text = font_small.render("Press ESC or Q to exit", True, (150, 150, 150))
-        screen.blit(info_text, (50, 60))
+        # Draw VU bars (left, right, mono) and their readouts
+        dirty = []
+        for (x, color, prefix), bar_rect, fill_rect, fill_area, level in zip(
+                bars, bar_rects, fill_rects, fill_areas, shown):
+            height = bar_heights[max(0, min(1000, round(level * 10)))]
+            fill_rect.y = bar_bottom - height
+            fill_area.y = bar_max_height - height
+            fill_area.height = height
+            blit(background, bar_rect, bar_rect)
+            blit(fill_surfs[color], fill_rect, fill_area)
+            draw_rect(screen, _TEST_FRAME_GREY, bar_rect, 2)
+            dirty.append(bar_rect)
+            dirty.append(_draw_text(prefix, _render_label(f"{prefix}: {level:.1f}", _TEST_LABEL_GREY),
+                                    (x, label_y)))
         
         # Sequence number (for debugging)
-        seq_text = font_small.render(f"Seq: {level_receiver.seq}", True, (100, 100, 100))
-        screen.blit(seq_text, (650, 450))
+        seq_text = render_small(f"Seq: {seq}", True, _TEST_FRAME_GREY)
+        dirty.append(_draw_text("seq", seq_text, (650, 450)))
         
-        pygame.display.flip()
-        clock.tick(30)
+        if full_redraw:
+            pygame.display.flip()
+            full_redraw = False
+        else:
+            pygame.display.update(dirty)
+        clock.tick(fps)  # cap the frame rate when packets arrive faster
     
     pygame.quit()
 
@@ -1175,6 +1445,22 @@ def run_test_display(level_receiver):
 # =============================================================================
 # Main
 
+# (args attribute, config section, key) copied into config when given on the
+# command line (truthy). Flags with side effects are handled in main().
+_CLI_VALUE_OVERRIDES = (
+    ('server', 'server', 'host'),
+    ('level_port', 'server', 'level_port'),
+    ('spectrum_port', 'server', 'spectrum_port'),
+    ('volumio_port', 'server', 'volumio_port'),
+    ('discovery_timeout', 'server', 'discovery_timeout'),
+    ('templates', 'templates', 'local_path'),
+    ('spectrum_templates', 'templates', 'spectrum_local_path'),
+    ('debug', 'debug', 'level'),
+    ('trace_spectrum', 'debug', 'trace_spectrum'),
+    ('trace_network', 'debug', 'trace_network'),
+)
+
+
 def main():
     # Check if we're running with a terminal (for interactive features)
     has_terminal = sys.stdin.isatty() and sys.stdout.isatty()
@@ -1317,37 +1603,20 @@ def main():
         print(f"  Spectrum templates: {config['templates'].get('spectrum_local_path') or defaults['spectrum_local_path']}")
     
     # Command-line arguments override config file
-    if args.server:
-        config["server"]["host"] = args.server
-    if args.level_port:
-        config["server"]["level_port"] = args.level_port
-    if args.spectrum_port:
-        config["server"]["spectrum_port"] = args.spectrum_port
-    if args.volumio_port:
-        config["server"]["volumio_port"] = args.volumio_port
-    if args.discovery_timeout:
-        config["server"]["discovery_timeout"] = args.discovery_timeout
+    for attr, section, key in _CLI_VALUE_OVERRIDES:
+        value = getattr(args, attr)
+        if value:
+            config[section][key] = value
     if args.windowed:
         config["display"]["windowed"] = True
         config["display"]["fullscreen"] = False
     if args.fullscreen:
         config["display"]["fullscreen"] = True
         config["display"]["windowed"] = False
-    if args.no_mount:
-        config["templates"]["use_smb"] = False
-    if args.templates:
-        config["templates"]["local_path"] = args.templates
+    if args.no_mount or args.templates:
         config["templates"]["use_smb"] = False
-    if args.spectrum_templates:
-        config["templates"]["spectrum_local_path"] = args.spectrum_templates
-    if args.decay_rate is not None:
+    if args.decay_rate is not None:  # 0.0 is a valid rate
         config["spectrum"]["decay_rate"] = args.decay_rate
-    if args.debug:
-        config["debug"]["level"] = args.debug
-    if args.trace_spectrum:
-        config["debug"]["trace_spectrum"] = True
-    if args.trace_network:
-        config["debug"]["trace_network"] = True
     
     # Initialize client debug system from config
     init_client_debug(config)
@@ -1370,15 +1639,8 @@ def main():
     
     if server_host:
         # Manual server specification
-        # Try to resolve hostname to IP
-        try:
-            ip = socket.gethostbyname(server_host)
-        except socket.gaierror:
-            # Try with .local suffix
-            try:
-                ip = socket.gethostbyname(f"{server_host}.local")
-            except socket.gaierror:
-                ip = server_host  # Assume it's an IP
+        # Resolve hostname to IP (tries host and host.local; IPs pass through)
+        ip = resolve_server_host(server_host)
         
         server_info = {
             'ip': ip,
@@ -1462,8 +1724,14 @@ def main():
     # Handle graceful shutdown
     def signal_handler(sig, frame):
         print("\nShutting down...")
-        level_receiver.stop()
-        spectrum_receiver.stop()
+        # Each stop() may wait up to 2 s for its receive thread; run them side by side
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            for future in [pool.submit(r.stop) for r in (level_receiver, spectrum_receiver)]:
+                try:
+                    future.result()
+                except Exception as e:
+                    log_client(f"Receiver stop failed: {e}", "verbose")
         if smb_mount:
             smb_mount.unmount()
         sys.exit(0)
@@ -1491,7 +1759,7 @@ def main():
         # Simple test display (no discovery listener; bind default ports only)
         level_receiver.start()
         spectrum_receiver.start()
-        run_test_display(level_receiver)
+        run_test_display(level_receiver, fps=config["display"].get("fps", 20))
     else:
         # Full PeppyMeter rendering
         success = run_peppymeter_display(level_receiver, server_info, 
@@ -1500,11 +1768,12 @@ def main():
                                          client_config=config)
         if not success:
             print("\nFalling back to test display...")
-            run_test_display(level_receiver)
+            run_test_display(level_receiver, fps=config["display"].get("fps", 20))
     
     # Cleanup
     level_receiver.stop()
     spectrum_receiver.stop()
+    config_fetcher.close()
     if smb_mount:
         smb_mount.unmount()
 